@@ -1,24 +1,259 @@
 """Task 1"""
-def caching_fibonacci() -> int:
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import Iterable, List
+
+CACHE_SIZE = 256
+CACHE_BYTES = 64 << 20
+MISSING = object()
+PISANO_LIMIT = 1 << 23
+STEP_LIMIT = 64
+RADIX_BITS = 16
+RADIX_MIN_BATCH = 1024
+
+def fibonacci_pair(n: int, modulus: int = None) -> tuple:
+    """Calculate the pair of fibonacci numbers F(n) and F(n+1) by fast doubling.
+
+    Bits of n are read from the highest one, and every step doubles the index:
+    F(2k) = F(k) * (2F(k+1) - F(k)) and F(2k+1) = F(k)^2 + F(k+1)^2. So it takes
+    O(log n) big integer multiplications and no recursion.
+
+    Args:
+        n (int): The index of the fibonacci number, non-negative.
+        modulus (int): If given, the numbers are calculated modulo it, so they
+            never grow larger than the modulus.
+
+    Returns:
+        tuple: F(n) and F(n+1).
+    """
+    if n < 0:
+        raise ValueError('Index of a fibonacci number must be non-negative.')
+    current, following = 0, 1
+    for bit in bin(n)[2:]:
+        double = current * (2 * following - current)
+        double_next = current * current + following * following
+        if modulus is not None:
+            double %= modulus
+            double_next %= modulus
+        if bit == '1':
+            current, following = double_next, double + double_next
+        else:
+            current, following = double, double_next
+    return current, following
+
+def fibonacci_number(n: int) -> int:
+    """Calculate the fibonacci number F(n) by fast doubling.
+
+    The last doubling step calculates only F(n), which saves about half of the time
+    for large n, as the last step works with the largest numbers.
+
+    Args:
+        n (int): The index of the fibonacci number, non-negative.
+
+    Returns:
+        int: F(n).
+    """
+    current, following = fibonacci_pair(n >> 1)
+    if n & 1:
+        return current * current + following * following
+    return current * (2 * following - current)
+
+class LRUCache:
+    """Cache of the least recently used eviction, bounded by entries and by bytes.
+
+    The size of a value is `sys.getsizeof`, so a big integer counts for its real
+    memory. Hits, misses and evictions are counted and returned by `stats`. With
+    `thread_safe`, one cache can be shared by several threads.
+    """
+
+    def __init__(self, max_entries: int = CACHE_SIZE, max_bytes: int = CACHE_BYTES,
+                 thread_safe: bool = False) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.data = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock() if thread_safe else nullcontext()
+
+    def get(self, key, default=None):
+        """Return the cached value, marking it as the most recently used one."""
+        with self._lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+                self.hits += 1
+                return self.data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value) -> None:
+        """Cache the value, evicting the least recently used ones to fit the limits.
+
+        A value larger than `max_bytes` alone isn't cached.
+        """
+        size = sys.getsizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self.data:
+                self.bytes -= sys.getsizeof(self.data.pop(key))
+            self.data[key] = value
+            self.bytes += size
+            while len(self.data) > self.max_entries or self.bytes > self.max_bytes:
+                _, evicted = self.data.popitem(last=False)
+                self.bytes -= sys.getsizeof(evicted)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """Return the counters of the cache and its current size."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self.data), 'bytes': self.bytes}
+
+def pisano_table(modulus: int, limit: int = PISANO_LIMIT):
+    """Calculate fibonacci numbers modulo m over one Pisano period.
+
+    The sequence F(n) mod m repeats with the period (Pisano period) of at most 6m,
+    so F(n) mod m is the item n % period of the table.
+
+    Args:
+        modulus (int): The modulus m, positive.
+        limit (int): The longest period to calculate; longer ones are given up.
+
+    Returns:
+        The table of F(0) ... F(period - 1) modulo m, an array of 64-bit integers if
+        they fit in it, or None if the period is longer than the limit.
+    """
+    if modulus == 1:
+        return array('q', [0])
+    table = array('q') if modulus <= 1 << 63 else []
+    current, following = 0, 1
+    for _ in range(limit):
+        table.append(current)
+        current, following = following, (current + following) % modulus
+        if current == 0 and following == 1:
+            return table
+    return None
+
+def _radix_residues(indices: List[int], modulus: int) -> List[int]:
+    """Calculate F(n) mod m for many indices with tables of pairs for digits of n.
+
+    For every digit position j (RADIX_BITS bits each) the table holds the pairs
+    F(d << j), F((d << j) + 1) for all digits d. F(n) is then the sum of the pairs
+    of its digits by F(a + b) = F(a)F(b + 1) + F(a + 1)F(b) - F(a)F(b) and
+    F(a + b + 1) = F(a + 1)F(b + 1) + F(a)F(b), a few steps per index instead of
+    a step per bit.
+    """
+    mask = (1 << RADIX_BITS) - 1
+    levels = []
+    for shift in range(0, max(indices).bit_length(), RADIX_BITS):
+        step, step_next = fibonacci_pair(1 << shift, modulus)
+        currents, followings = [0], [1]
+        current, following = 0, 1
+        for _ in range(mask):
+            common = current * step
+            current, following = ((current * step_next + following * step - common) % modulus,
+                                  (following * step_next + common) % modulus)
+            currents.append(current)
+            followings.append(following)
+        levels.append((currents, followings))
+    residues = []
+    for n in indices:
+        current, following = 0, 1
+        for currents, followings in levels:
+            digit = n & mask
+            if digit:
+                step, step_next = currents[digit], followings[digit]
+                common = current * step
+                current, following = ((current * step_next + following * step - common)
+                                      % modulus, (following * step_next + common) % modulus)
+            n >>= RADIX_BITS
+            if not n:
+                break
+        residues.append(current)
+    return residues
+
+def fibonacci_batch(indices: Iterable[int], modulus: int = None) -> List[int]:
+    """Calculate fibonacci numbers (or their residues modulo m) for many indices at once.
+
+    With a modulus, F(n) mod m is looked up in the table of the Pisano period, if
+    it isn't too long, or a large batch is calculated by `_radix_residues`.
+    Otherwise indices are sorted and deduplicated, and each number is calculated
+    from the previous one by a few additions if it's close, or by fast doubling.
+
+    Args:
+        indices (Iterable[int]): Indices of the fibonacci numbers, non-negative.
+        modulus (int): If given, the residues of the numbers modulo it are calculated.
+
+    Returns:
+        List[int]: The numbers in the order of the indices.
+    """
+    indices = indices if isinstance(indices, (list, tuple, array)) else list(indices)
+    if indices and min(indices) < 0:
+        raise ValueError('Index of a fibonacci number must be non-negative.')
+    if modulus is not None:
+        if modulus < 1:
+            raise ValueError('Modulus must be positive.')
+        # The period is at most 6m, so larger moduli aren't worth trying
+        table = pisano_table(modulus) if 6 * modulus <= PISANO_LIMIT else None
+        if table is not None:
+            period = len(table)
+            return [table[n % period] for n in indices]
+        if len(indices) >= RADIX_MIN_BATCH:
+            return _radix_residues(indices, modulus)
+    numbers = {}
+    index, current, following = 0, 0, 1
+    for n in sorted(set(indices)):
+        if n - index > STEP_LIMIT:
+            index = n
+            current, following = fibonacci_pair(n, modulus)
+        while index < n:
+            index += 1
+            current, following = following, current + following
+            if modulus is not None:
+                following %= modulus
+        numbers[n] = current
+    return [numbers[n] for n in indices]
+
+def caching_fibonacci(cache: LRUCache = None, verbose: bool = False) -> int:
     """Calculating fibonacci numbers and saving them to cache. Returning
     values from cache in case of need.
+
+    Only the requested numbers are cached, not the intermediate ones. The counters
+    of the cache are returned by the `stats` attribute of the function.
+
+    Args:
+        cache (LRUCache): The cache to use, e.g. shared by several functions or threads.
+            By default it is a new `LRUCache`.
+        verbose (bool): If True, every call prints if its value was taken from cache.
     """
-    cache = {0: 0, 1: 1}
+    cache = LRUCache() if cache is None else cache
     def fibonacci(n: int) -> int:
-        if n in cache:
-            print('return from cache')
-            return cache[n]
-        cache[n] = fibonacci(n-2) + fibonacci(n-1)
-        print('return calculated')
-        return cache[n]
+        value = cache.get(n, MISSING)
+        if value is not MISSING:
+            if verbose:
+                print('return from cache')
+            return value
+        value = fibonacci_number(n)
+        cache.put(n, value)
+        if verbose:
+            print('return calculated')
+        return value
+    fibonacci.cache = cache
+    fibonacci.stats = cache.stats
+    fibonacci.batch = fibonacci_batch
     return fibonacci
 
-
 if __name__ == "__main__":
-    fib = caching_fibonacci()
+    fib = caching_fibonacci(verbose=True)
     print(f'Result: {fib(0)}')
     print(f'Result: {fib(1)}')
     print(f'Result: {fib(10)}')
     print(f'Result: {fib(10)}')
     print(f'Result: {fib(15)}')
     print(f'Result: {fib(15)}')
+    print(f'Cache: {fib.stats()}')
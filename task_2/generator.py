@@ -1,7 +1,19 @@
 """imports"""
-from typing import Callable, Generator, Any
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
+from typing import Callable, Generator, Any, Iterable, Iterator, List, Union
+import codecs
+import math
+import os
 import re
 
+NUMBER_PATTERN = re.compile(r'\b\d+\.\d+\b')
+CHUNK_SIZE = 1 << 20
+SHARD_SIZE = 16 << 20
+SUM_BLOCK = 1 << 20
+SEPARATOR_BYTES = b' \t\r\n'
+
 def generator_numbers(text: str) -> Generator[float, Any, Any]:
     """Generate real numbers from the given text.
 
@@ -12,23 +24,206 @@ def generator_numbers(text: str) -> Generator[float, Any, Any]:
         Generator[float, Any, Any]:  generator yielding the real
         numbers found in the text.
     """
-    pattern = r'\b\d+\.\d+\b'
-    for i in re.findall(pattern, text):
-        yield float(i)
+    for match in NUMBER_PATTERN.finditer(text):
+        yield float(match.group())
+
+def read_chunks(source: Union[str, os.PathLike, Any, Iterable],
+                chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Read text chunks from a file path, a file object, an iterable of chunks or a text.
+
+    Bytes are decoded as UTF-8, also when a character is split between chunks. A
+    path must be an `os.PathLike` (e.g. `pathlib.Path`); a `str` is the text itself.
+
+    Args:
+        source: The path to a file, a text or binary file object, an iterable
+            of str or bytes chunks, or a text.
+        chunk_size (int): The number of characters (or bytes) to read at once from a file.
+
+    Yields:
+        Iterator[str]: Chunks of the text.
+    """
+    if isinstance(source, str):
+        source = [source]
+    elif isinstance(source, os.PathLike):
+        with open(source, "r", encoding="utf-8") as text_file:
+            yield from read_chunks(text_file, chunk_size)
+        return
+    chunks = source
+    if hasattr(source, 'read'):
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in chunks:
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+def _tail_start(text: str) -> int:
+    """Find where the trailing run of word characters and dots of the text starts.
+
+    Numbers consist of such characters, so a number can't cross anything else.
+    """
+    start = len(text)
+    while start and (text[start - 1].isalnum() or text[start - 1] in '._'):
+        start -= 1
+    return start
+
+def generator_numbers_stream(source: Union[str, os.PathLike, Any, Iterable],
+                             chunk_size: int = CHUNK_SIZE) -> Generator[float, Any, Any]:
+    """Generate real numbers from a file or a stream of text, chunk by chunk.
+
+    Only the end of a chunk that may belong to a number cut by the chunk
+    boundary is kept until the next chunk, so the memory use doesn't depend on
+    the size of the text and the numbers are the same as `generator_numbers`
+    would find in the whole text.
+
+    Args:
+        source: The path (`os.PathLike`) to a file, a text or binary file object,
+            an iterable of str or bytes chunks, or a text.
+        chunk_size (int): The number of characters (or bytes) to read at once from a file.
+
+    Yields:
+        Generator[float, Any, Any]:  generator yielding the real
+        numbers found in the text.
+    """
+    carry = ''
+    for chunk in read_chunks(source, chunk_size):
+        buffer = carry + chunk
+        # The character before the tail is kept too, as the context of its word boundary
+        cut = max(_tail_start(buffer) - 1, 0)
+        for match in NUMBER_PATTERN.finditer(buffer, 0, cut):
+            yield float(match.group())
+        carry = buffer[cut:]
+    yield from generator_numbers(carry)
+
+def exact_partials(numbers: Iterable[float], partials: List[float] = ()) -> List[float]:
+    """Sum the numbers exactly, as a short list of floats whose exact sum is the total.
+
+    Every `math.fsum` pass returns the correctly rounded remainder of the exact sum
+    that the partials found so far don't cover yet, until nothing remains. It takes
+    two or three passes over a block of numbers, so blocks of SUM_BLOCK numbers are
+    kept in memory.
+
+    Args:
+        numbers (Iterable[float]): The numbers to sum.
+        partials (List[float]): Partials of the numbers summed before, to add to.
+
+    Returns:
+        List[float]: The partials; `math.fsum` of them is the correctly rounded total.
+    """
+    numbers = iter(numbers)
+    partials = list(partials)
+    while block := list(islice(numbers, SUM_BLOCK)):
+        block.extend(partials)
+        partials = []
+        while remainder := math.fsum(chain(block, (-partial for partial in partials))):
+            partials.append(remainder)
+            if not math.isfinite(remainder):
+                return partials
+    return partials
 
-def sum_profit(text: str, func: Callable) -> float:
+def _text_boundary(text: str, position: int) -> int:
+    """Find the first position at or after the given one where a text can be split.
+
+    It is a character that can't be a part of a number, so the numbers of the
+    parts are the same as the numbers of the whole text.
+    """
+    while position < len(text) and (text[position].isalnum() or text[position] in '._'):
+        position += 1
+    return position
+
+def _file_boundary(file_path: os.PathLike, position: int) -> int:
+    """Find the first offset at or after the given one where a file can be split (a whitespace)."""
+    with open(file_path, "rb") as shard_file:
+        shard_file.seek(position)
+        while window := shard_file.read(1 << 16):
+            for offset, byte in enumerate(window):
+                if byte in SEPARATOR_BYTES:
+                    return position + offset
+            position += len(window)
+    return position
+
+def _plan_shards(documents: Iterable, shard_size: int) -> Iterator[tuple]:
+    """Split documents into shards of about `shard_size` characters (bytes for files).
+
+    Small texts are grouped into one shard, large texts and files are split at
+    characters that can't be a part of a number.
+    """
+    group = []
+    group_size = 0
+    for document in documents:
+        if isinstance(document, os.PathLike):
+            size = os.path.getsize(document)
+            start = 0
+            while start < size:
+                end = _file_boundary(document, min(start + shard_size, size))
+                yield ('file', document, start, end)
+                start = end
+            continue
+        if len(document) >= shard_size:
+            start = 0
+            while start < len(document):
+                end = _text_boundary(document, start + shard_size)
+                yield ('texts', [document[start:end]])
+                start = end
+            continue
+        group.append(document)
+        group_size += len(document)
+        if group_size >= shard_size:
+            yield ('texts', group)
+            group = []
+            group_size = 0
+    if group:
+        yield ('texts', group)
+
+def _sum_shard(func: Callable, shard: tuple) -> List[float]:
+    """Sum the numbers of a shard exactly (see `exact_partials`) in a worker process."""
+    if shard[0] == 'file':
+        _, file_path, start, end = shard
+        with open(file_path, "rb") as shard_file:
+            shard_file.seek(start)
+            texts = [shard_file.read(end - start).decode("utf-8")]
+    else:
+        texts = shard[1]
+    partials = []
+    for text in texts:
+        partials = exact_partials(func(text), partials)
+    return partials
+
+def sum_profit(text: str, func: Callable, workers: int = None,
+               shard_size: int = SHARD_SIZE) -> float:
     """Calculate the sum of real numbers extracted from the text
     using the provided function.
 
+    With `workers`, the text is split into shards that are summed in worker processes.
+    Every shard is summed exactly and the total is rounded once, so the result
+    doesn't depend on the number of workers or on the shards (it may differ from
+    the serial result in the last bits, as that one is rounded at every addition).
+
     Args:
-        text (str): The text to analyze.
+        text (str): The text to analyze, or a file or a stream of text for
+        `generator_numbers_stream`. In the parallel mode it may also be a list of
+        documents, each of them a text or a path (`pathlib.Path`) to a file.
         func (Callable): The function used to extract real numbers from the text.
+        It must be importable by the worker processes, e.g. `generator_numbers`.
+        workers (int): The number of worker processes for the parallel mode.
+        shard_size (int): The approximate size of a shard in characters (bytes for files).
 
     Returns:
         float: The total sum of the real numbers found in the text.
     """
-    total = sum(func(text))
-    return total
+    if workers is None:
+        total = sum(func(text))
+        return total
+    documents = [text] if isinstance(text, (str, os.PathLike)) else text
+    shards = _plan_shards(documents, shard_size)
+    sum_shard = partial(_sum_shard, func)
+    if workers == 1:
+        results = map(sum_shard, shards)
+        return math.fsum(chain.from_iterable(results))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(sum_shard, shards)
+        return math.fsum(chain.from_iterable(results))
 
 
 if __name__ == "__main__":
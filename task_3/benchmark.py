@@ -0,0 +1,283 @@
+"""imports"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from queue import Empty
+from typing import Callable, Dict, List, Union
+import log_reader
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MESSAGES = [
+    'User logged in successfully.',
+    'Attempting to connect to the database.',
+    'Database connection failed.',
+    'Data export completed.',
+    'Disk usage above 80%.',
+    'Starting data backup process.',
+    'Backup process failed.',
+    'User logged out.',
+    'Checking system health.',
+    'Scheduled maintenance.',
+]
+DEFAULT_MIX = 'INFO=50,DEBUG=30,ERROR=12,WARNING=8'
+SIZE_UNITS = {'': 1, 'B': 1, 'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+BATCH_LINES = 10000
+POLL_INTERVAL = 1.0
+
+
+def parse_size(value: str) -> int:
+    """Parse a size command line argument like '10MB' or '1GB'.
+
+    Args:
+        value (str): The size with an optional unit (B, KB, MB, GB).
+
+    Returns:
+        int: The size in bytes.
+    """
+    parsed = re.fullmatch(r'(\d+(?:\.\d+)?)\s*([KMG]?B?)', value.strip().upper())
+    if not parsed:
+        raise argparse.ArgumentTypeError('must be a number with an optional unit (KB, MB, GB)')
+    return int(float(parsed.group(1)) * SIZE_UNITS[parsed.group(2)])
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse a level mix command line argument like 'INFO=50,ERROR=10'.
+
+    Args:
+        value (str): Comma separated pairs of a log level and its weight.
+
+    Returns:
+        Dict[str, float]: Weights by log level.
+    """
+    try:
+        mix = {level: float(weight) for level, weight in
+               (item.split('=') for item in value.split(','))}
+    except ValueError as error:
+        raise argparse.ArgumentTypeError("must look like 'INFO=50,ERROR=10'") from error
+    if not mix or any(weight < 0 for weight in mix.values()) or not sum(mix.values()):
+        raise argparse.ArgumentTypeError('weights must be non-negative with a positive sum')
+    return mix
+
+def generate_log(file_path: str, size: int, mix: Dict[str, float], seed: int = 0) -> int:
+    """Write a synthetic log in the format of 'task_3/log.txt'.
+
+    Lines are written in chronological order, so the log can also be used for
+    time range queries. The same arguments always produce the same file.
+
+    Args:
+        file_path (str): The path of the log file to write.
+        size (int): The approximate size of the file in bytes.
+        mix (Dict[str, float]): Weights of the log levels.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        int: The number of written lines.
+    """
+    rng = random.Random(seed)
+    levels = list(mix)
+    weights = list(mix.values())
+    moment = datetime(2024, 1, 22)
+    written = 0
+    lines_total = 0
+    with open(file_path, "w", encoding="utf-8", newline='\n') as log_file:
+        while written < size:
+            batch = []
+            for level in rng.choices(levels, weights, k=BATCH_LINES):
+                moment += timedelta(seconds=rng.randint(0, 2))
+                batch.append(f'{moment:%Y-%m-%d %H:%M:%S} {level} {rng.choice(MESSAGES)}\n')
+            chunk = ''.join(batch)
+            if written + len(chunk) > size:
+                # Cutting the last batch to the requested size on a line boundary
+                chunk = chunk[:chunk.rfind('\n', 0, size - written) + 1]
+                if not chunk:
+                    break
+                batch = chunk.splitlines()
+            log_file.write(chunk)
+            written += len(chunk)
+            lines_total += len(batch)
+    return lines_total
+
+
+def _stage_parse_log_line(file_path: str) -> None:
+    with open(file_path, "r", encoding="utf-8") as log_file:
+        for line in log_file:
+            log_reader.parse_log_line(line)
+
+def _stage_load_logs(file_path: str) -> None:
+    for _ in log_reader.load_logs(file_path):
+        pass
+
+def _stage_filter_logs_by_level(file_path: str) -> None:
+    log_reader.filter_logs_by_level(log_reader.load_logs(file_path), 'error')
+
+def _stage_count_logs_by_level(file_path: str) -> None:
+    log_reader.count_logs_by_level(log_reader.load_logs(file_path))
+
+def _stage_count_logs_by_level_fast(file_path: str) -> None:
+    log_reader.count_logs_by_level_fast(file_path)
+
+def _stage_count_and_filter_logs_parallel(file_path: str) -> None:
+    log_reader.count_and_filter_logs_parallel(file_path, 'error', os.cpu_count() or 1)
+
+def _stage_load_log_store(file_path: str) -> None:
+    log_reader.load_log_store(file_path)
+
+def _stage_build_log_index(file_path: str) -> None:
+    log_reader.build_log_index(file_path)
+
+STAGES: Dict[str, Callable[[str], None]] = {
+    'parse_log_line': _stage_parse_log_line,
+    'load_logs': _stage_load_logs,
+    'filter_logs_by_level': _stage_filter_logs_by_level,
+    'count_logs_by_level': _stage_count_logs_by_level,
+    'count_logs_by_level_fast': _stage_count_logs_by_level_fast,
+    'count_and_filter_logs_parallel': _stage_count_and_filter_logs_parallel,
+    'load_log_store': _stage_load_log_store,
+    'build_log_index': _stage_build_log_index,
+}
+
+
+def peak_rss() -> Union[int, None]:
+    """Return the peak resident set size of the current process in bytes.
+
+    The largest peak of its finished child processes (e.g. workers of a process
+    pool) is added, as they run at the same time as the process.
+
+    Returns:
+        Union[int, None]: Peak RSS, or None if the platform doesn't report it.
+    """
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + \
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+def _run_stage(name: str, file_path: str, queue: multiprocessing.Queue) -> None:
+    start = time.perf_counter()
+    try:
+        STAGES[name](file_path)
+    except Exception as error:  # pylint: disable=broad-except
+        # Reporting the failure, or the parent would wait for the results forever
+        queue.put((None, None, f'{type(error).__name__}: {error}'))
+        return
+    queue.put((time.perf_counter() - start, peak_rss(), None))
+
+def run_stage(name: str, file_path: str, lines_total: int) -> dict:
+    """Run a benchmark stage in a separate process and measure it.
+
+    A fresh process per stage makes peak RSS belong to that stage only.
+
+    Args:
+        name (str): The name of the stage from `STAGES`.
+        file_path (str): The path to the log file.
+        lines_total (int): The number of lines in the log file.
+
+    Returns:
+        dict: Elapsed seconds, lines/sec, MB/sec and peak RSS of the stage.
+
+    Raises:
+        RuntimeError: If the stage failed or its process died.
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run_stage, args=(name, file_path, queue))
+    process.start()
+    while True:
+        try:
+            elapsed, rss, error = queue.get(timeout=POLL_INTERVAL)
+            break
+        except Empty:
+            if process.exitcode is not None and queue.empty():
+                raise RuntimeError(f'process exited with code {process.exitcode}') from None
+    process.join()
+    if error is not None:
+        raise RuntimeError(error)
+    size = os.path.getsize(file_path)
+    return {
+        'stage': name,
+        'seconds': round(elapsed, 4),
+        'lines_per_sec': round(lines_total / elapsed, 1) if elapsed else None,
+        'mb_per_sec': round(size / (1 << 20) / elapsed, 2) if elapsed else None,
+        'peak_rss_mb': round(rss / (1 << 20), 1) if rss is not None else None,
+    }
+
+def display_results(results: List[dict]) -> None:
+    """Display benchmark results in a tabular format.
+
+    Args:
+        results (List[dict]): Results returned by `run_stage`.
+    """
+    print(f"\n{'Stage'.ljust(32)}|{'Seconds'.rjust(10)}|{'Lines/sec'.rjust(13)}|"
+          f"{'MB/sec'.rjust(9)}|{'Peak RSS, MB'.rjust(13)}")
+    print('_' * 32 + '|' + '_' * 10 + '|' + '_' * 13 + '|' + '_' * 9 + '|' + '_' * 13)
+    for result in results:
+        print(f"{result['stage'].ljust(32)}|{str(result['seconds']).rjust(10)}|"
+              f"{str(result['lines_per_sec']).rjust(13)}|{str(result['mb_per_sec']).rjust(9)}|"
+              f"{str(result['peak_rss_mb']).rjust(13)}")
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark of log_reader on a synthetic log.')
+    parser.add_argument('--size', type=parse_size, default='10MB',
+                        help='size of the generated log, e.g. 1MB or 10GB (default: 10MB)')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help=f'weights of log levels (default: {DEFAULT_MIX})')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    parser.add_argument('--log', help='path for the generated log (default: temporary file)')
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES),
+                        help='stages to run (default: all)')
+    parser.add_argument('-o', '--output', help='path of the JSON file to save results to')
+    return parser.parse_args()
+
+def main():
+    """Generate a synthetic log, benchmark log_reader stages on it and save the results."""
+    args = parse_args()
+    file_path = args.log or os.path.join(tempfile.mkdtemp(), 'synthetic.log')
+    print(f'Generating {args.size} bytes of log to {file_path}...')
+    lines_total = generate_log(file_path, args.size, args.mix, args.seed)
+    results = []
+    try:
+        for name in args.stages:
+            try:
+                results.append(run_stage(name, file_path, lines_total))
+            except RuntimeError as error:
+                print(f'Stage {name} failed: {error}')
+    finally:
+        if not args.log:
+            os.remove(file_path)
+            os.rmdir(os.path.dirname(file_path))
+    display_results(results)
+    if args.output:
+        report = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'size': args.size,
+            'lines': lines_total,
+            'mix': args.mix,
+            'seed': args.seed,
+            'results': results,
+        }
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f'\nResults saved to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
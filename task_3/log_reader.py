@@ -1,12 +1,36 @@
 """imports"""
+import argparse
+import bz2
+import glob
+import gzip
+import hashlib
+import heapq
+import json
+import lzma
+import mmap
+import os
 import re
-import sys
-from typing import Match, List, Union
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from typing import IO, Match, Iterable, Iterator, List, Tuple, Union
 from pathlib import Path
 import colorama
 from colorama import Fore
 colorama.init(autoreset=True)
 
+LEVEL_PATTERN = re.compile(
+    rb'^[^\n]*?\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} (\w+) [^\n]*?[^\r\n]', re.MULTILINE
+)
+MMAP_BLOCK = 1 << 24
+LOG_LINE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2}) (\d{2}:\d{2}:\d{2}) (\w+) (.+)')
+INDEX_SUFFIX = '.idx'
+INDEX_SAMPLE = 1 << 16
+FOLLOW_BLOCK = 1 << 20
+COMPRESSED_OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+MALFORMED_SAMPLES = 10
+
 
 def parse_log_line(line: str) -> dict:
     """Parse a log line and extract relevant information.
@@ -25,8 +49,7 @@ def parse_log_line(line: str) -> dict:
     Returns:
         dict: A dictionary containing the parsed information.
     """
-    pattern: str = r'(\d{4}-\d{2}-\d{2}) (\d{2}:\d{2}:\d{2}) (\w+) (.+)'
-    parsed: Match[str] = re.search(pattern, line)
+    parsed: Match[str] = LOG_LINE_PATTERN.search(line)
     if parsed:
         return {
             'date': parsed.group(1),
@@ -35,66 +58,170 @@ def parse_log_line(line: str) -> dict:
             'message': parsed.group(4)
         }
 
-def load_logs(file_path: str) -> Union[List[dict], None]:
-    """Load and parse log entries from a file.
+class MalformedLines:
+    """Statistics of log lines with incorrect format, collected in tolerant mode.
+
+    Only the first `MALFORMED_SAMPLES` lines are kept, together with their sources
+    and line numbers; the rest are just counted.
+    """
+
+    def __init__(self, limit: Union[int, None] = None) -> None:
+        self.limit = limit
+        self.count = 0
+        self.samples: List[Tuple[str, int, str]] = []
+
+    def add(self, source: str, line_number: int, line: str) -> None:
+        """Record a malformed line.
+
+        Args:
+            source (str): The path to the log file.
+            line_number (int): The number of the line, starting from 1.
+            line (str): The line itself.
+
+        Raises:
+            ValueError: If the number of malformed lines exceeds the limit.
+        """
+        self.count += 1
+        if len(self.samples) < MALFORMED_SAMPLES:
+            self.samples.append((str(source), line_number, line.rstrip("\r\n")))
+        self.check()
+
+    def merge(self, other: 'MalformedLines', line_shift: int = 0) -> None:
+        """Add malformed lines collected separately, e.g. by a worker process.
+
+        Args:
+            other (MalformedLines): The statistics to add.
+            line_shift (int): The number to add to the line numbers of `other`.
+
+        Raises:
+            ValueError: If the number of malformed lines exceeds the limit.
+        """
+        self.count += other.count
+        for source, line_number, line in other.samples:
+            if len(self.samples) < MALFORMED_SAMPLES:
+                self.samples.append((source, line_number + line_shift, line))
+        self.check()
+
+    def check(self) -> None:
+        """Make sure the number of malformed lines is within the limit.
+
+        Raises:
+            ValueError: If the number of malformed lines exceeds the limit.
+        """
+        if self.limit is not None and self.count > self.limit:
+            raise ValueError('Too many malformed lines.')
+
+def handle_malformed_line(errors: Union[MalformedLines, None], source: str,
+                          line_number: int, line: str) -> None:
+    """Fail on a malformed line in strict mode, or record it in tolerant mode.
+
+    Args:
+        errors (Union[MalformedLines, None]): Statistics to record the line to,
+            or None for strict mode.
+        source (str): The path to the log file.
+        line_number (int): The number of the line, starting from 1.
+        line (str): The line itself.
+
+    Raises:
+        ValueError: In strict mode, or if there are too many malformed lines.
+    """
+    if errors is None:
+        raise ValueError('Wrong data format.')
+    errors.add(source, line_number, line)
+
+def open_log(file_path: str) -> IO[str]:
+    """Open a log file for reading as text, decompressing it on the fly if needed.
+
+    Lines are split only at '\\n', as in the binary paths (ranges, the index), so
+    a bare '\\r' stays inside of a line and every path reads the same lines.
+
+    Args:
+        file_path (str): The path to the log file. Files with '.gz', '.bz2' and '.xz'
+            suffixes are treated as compressed.
+
+    Returns:
+        IO[str]: The opened file.
+    """
+    opener = COMPRESSED_OPENERS.get(Path(file_path).suffix)
+    if opener:
+        return opener(file_path, "rt", encoding="utf-8", newline="\n")
+    return open(file_path, "r", encoding="utf-8", newline="\n")
+
+def is_compressed(file_path: str) -> bool:
+    """Check if a log file is compressed, judging by its suffix.
+
+    Args:
+        file_path (str): The path to the log file.
+
+    Returns:
+        bool: True if the file is compressed.
+    """
+    return Path(file_path).suffix in COMPRESSED_OPENERS
+
+def load_logs(file_path: str, errors: Union[MalformedLines, None] = None) -> Iterator[dict]:
+    """Lazily load and parse log entries from a file.
 
-    This function reads log entries from a specified file, parses each entry,
-    and returns a list of dictionaries containing the parsed information.
+    This function reads the specified file line by line and yields parsed entries
+    one at a time, so memory usage does not depend on the size of the file.
+    Compressed files are decompressed while being read.
     Note:
         This function relies on the `parse_log_line` function to parse individual log lines.
+        The file is opened on the first iteration, so `FileNotFoundError` is raised
+        by the consumer of the generator.
 
     Args:
         file_path (str): The path to the log file to be loaded and parsed.
+        errors (Union[MalformedLines, None]): Statistics to record lines with incorrect
+            format to, skipping them. If None, such lines are not tolerated.
 
-    Returns:
-        Union[List[dict], None]: A list of dictionaries representing the parsed log entries,
-        or None if there was an error during file processing or if the log data has incorrect
-        format.
-        
+    Yields:
+        Iterator[dict]: Dictionaries representing the parsed log entries.
+
+    Raises:
+        ValueError: If a line of the log has incorrect format in strict mode, or if
+            there are too many of them in tolerant mode.
     """
-    output = []
-    try:
-        with open (file_path, "r", encoding="utf-8") as log_file:
-            lines: list = log_file.readlines()
-            for line in lines:
-                parsed_line = parse_log_line(line)
-                if parsed_line:
-                    output.append(parsed_line)
-                else:
-                    print(f'{Fore.RED}Wrong data format.')
-                    return None
-            return output
-    except FileNotFoundError:
-        print(f'{Fore.RED}File not found.')
-        return None
+    with open_log(file_path) as log_file:
+        for line_number, line in enumerate(log_file, 1):
+            line = line.rstrip("\r\n")
+            parsed_line = parse_log_line(line)
+            if not parsed_line:
+                handle_malformed_line(errors, file_path, line_number, line)
+                continue
+            yield parsed_line
 
-def filter_logs_by_level(logs: list, level: str) -> list:
+def filter_logs_by_level(logs: Iterable[dict], level: str) -> list:
     """Filter log entries by log level.
 
-    This function takes a list of log entries and filters them based on the specified log level.
-    The log level comparison is case-insensitive.
+    This function takes an iterable of log entries and filters them based on the specified
+    log level. The log level comparison is case-insensitive.
 
     Args:
-        logs (list): A list of dictionaries representing log entries.
+        logs (Iterable[dict]): An iterable of dictionaries representing log entries.
         level (str): The log level to filter by. Case-insensitive.
 
     Returns:
         list: A list of log entries matching the specified log level.
+        If `logs` is a `LogStore`, a `LogStore` with the matching entries is returned.
     """
+    if isinstance(logs, LogStore):
+        return logs.filter_by_level(level)
     return list(filter(lambda line: line['level'].lower() == level, logs))
 
-def count_logs_by_level(logs: list) -> dict:
-    """Count the occurrences of each log level in a list of log entries.
+def count_logs_by_level(logs: Iterable[dict]) -> dict:
+    """Count the occurrences of each log level in log entries.
 
-    This function takes a list of log entries and counts the occurrences of each log level.
+    This function takes an iterable of log entries and counts the occurrences of each log level.
 
     Args:
-        logs (list): A list of dictionaries representing log entries.
+        logs (Iterable[dict]): An iterable of dictionaries representing log entries.
 
     Returns:
         dict: A dictionary where keys are log levels and values are the counts
-            of occurrences of each log level in the input list of log entries.
+            of occurrences of each log level in the input log entries.
     """
+    if isinstance(logs, LogStore):
+        return logs.count_by_level()
     output = {}
     for line in logs:
         level = line.get('level')
@@ -105,6 +232,706 @@ def count_logs_by_level(logs: list) -> dict:
 
     return output
 
+def count_and_filter_logs(logs: Iterable[dict], level: Union[str, bool]) -> Tuple[dict, list]:
+    """Count log levels and filter log entries in a single pass over the logs.
+
+    Only the entries matching `level` are kept in memory, so the stream produced by
+    `load_logs` is consumed once without being materialized.
+
+    Args:
+        logs (Iterable[dict]): An iterable of dictionaries representing log entries.
+        level (Union[str, bool]): The log level to filter by, or False to skip filtering.
+
+    Returns:
+        Tuple[dict, list]: Counts of each log level and the list of matching log entries.
+    """
+    counts = {}
+    filtered = []
+    for line in logs:
+        line_level = line['level']
+        counts[line_level] = counts.get(line_level, 0) + 1
+        if level and line_level.lower() == level:
+            filtered.append(line)
+    return counts, filtered
+
+def count_logs_by_level_fast(file_path: str,
+                             errors: Union[MalformedLines, None] = None) -> dict:
+    """Count the occurrences of each log level directly in a memory-mapped file.
+
+    The level token is matched on raw bytes, so no lines are decoded and no
+    per-line dictionaries are created. If some line can't be matched this way
+    (e.g. non-ASCII level names), the function falls back to full parsing, which
+    also reports lines with incorrect format.
+
+    Args:
+        file_path (str): The path to the log file.
+        errors (Union[MalformedLines, None]): Statistics of malformed lines for
+            tolerant mode, or None for strict mode.
+
+    Returns:
+        dict: A dictionary where keys are log levels and values are the counts
+            of occurrences of each log level in the file.
+
+    Raises:
+        ValueError: If a line of the log has incorrect format in strict mode, or if
+            there are too many of them in tolerant mode.
+    """
+    with open(file_path, "rb") as log_file:
+        if os.fstat(log_file.fileno()).st_size == 0:
+            return {}
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            counts = {}
+            for match in LEVEL_PATTERN.finditer(data):
+                level = match.group(1)
+                counts[level] = counts.get(level, 0) + 1
+            lines_total = sum(data[i:i + MMAP_BLOCK].count(b'\n')
+                              for i in range(0, len(data), MMAP_BLOCK))
+            lines_total += data[-1:] != b'\n'
+    if sum(counts.values()) != lines_total:
+        return count_logs_by_level(load_logs(file_path, errors))
+    return {level.decode("ascii"): count for level, count in counts.items()}
+
+class LogStore:
+    """Compact columnar storage of parsed log entries.
+
+    Instead of a dictionary per entry, the store keeps:
+        - level codes in a byte array, with level names interned in `levels`;
+        - date and time packed into one integer `YYYYMMDDHHMMSS` per entry;
+        - messages encoded into one shared buffer, addressed by offsets.
+    Entries are materialized as dictionaries only when they are accessed.
+    """
+
+    def __init__(self) -> None:
+        self.levels: List[str] = []
+        self._level_codes: dict = {}
+        self.codes = array('B')
+        self.timestamps = array('q')
+        self.offsets = array('Q', [0])
+        self.messages = bytearray()
+
+    def append(self, date: str, time: str, level: str, message: str) -> None:
+        """Add a single log entry to the store.
+
+        Args:
+            date (str): The date of the log entry in the format 'YYYY-MM-DD'.
+            time (str): The time of the log entry in the format 'HH:MM:SS'.
+            level (str): The log level.
+            message (str): The log message.
+
+        Raises:
+            ValueError: If the store already holds 256 different levels.
+        """
+        code = self._level_codes.get(level)
+        if code is None:
+            code = len(self.levels)
+            if code > 255:
+                raise ValueError('Too many log levels.')
+            self._level_codes[level] = code
+            self.levels.append(level)
+        self.codes.append(code)
+        self.timestamps.append(int(date.replace('-', '') + time.replace(':', '')))
+        self.messages += message.encode("utf-8")
+        self.offsets.append(len(self.messages))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> dict:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('LogStore index out of range')
+        packed = str(self.timestamps[index]).zfill(14)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return {
+            'date': f'{packed[:4]}-{packed[4:6]}-{packed[6:8]}',
+            'time': f'{packed[8:10]}:{packed[10:12]}:{packed[12:]}',
+            'level': self.levels[self.codes[index]],
+            'message': self.messages[start:end].decode("utf-8")
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def count_by_level(self) -> dict:
+        """Count the occurrences of each log level.
+
+        Returns:
+            dict: A dictionary where keys are log levels and values are the counts.
+        """
+        codes = self.codes.tobytes()
+        counts = {level: codes.count(code) for code, level in enumerate(self.levels)}
+        # A filtered store shares the levels of the whole one, some of them missing
+        return {level: count for level, count in counts.items() if count}
+
+    def filter_by_level(self, level: str) -> 'LogStore':
+        """Select entries with the given log level. Case-insensitive.
+
+        Args:
+            level (str): The log level to filter by.
+
+        Returns:
+            LogStore: A new store containing only the matching entries.
+        """
+        mask_table = bytes(level_name.lower() == level.lower() for level_name in self.levels)
+        mask = self.codes.tobytes().translate(mask_table.ljust(256, b'\0'))
+        output = LogStore()
+        # Copies, so levels added to the new store don't show up in this one
+        output.levels = list(self.levels)
+        output._level_codes = dict(self._level_codes)
+        for index in compress(range(len(self)), mask):
+            output.codes.append(self.codes[index])
+            output.timestamps.append(self.timestamps[index])
+            start, end = self.offsets[index], self.offsets[index + 1]
+            output.messages += self.messages[start:end]
+            output.offsets.append(len(output.messages))
+        return output
+
+def load_log_store(file_path: str, errors: Union[MalformedLines, None] = None) -> LogStore:
+    """Load log entries from a file into a columnar `LogStore`.
+
+    Args:
+        file_path (str): The path to the log file to be loaded and parsed.
+        errors (Union[MalformedLines, None]): Statistics to record lines with incorrect
+            format to, skipping them. If None, such lines are not tolerated.
+
+    Returns:
+        LogStore: The store containing all the log entries.
+
+    Raises:
+        ValueError: If a line of the log has incorrect format in strict mode, or if
+            there are too many of them in tolerant mode.
+    """
+    store = LogStore()
+    with open_log(file_path) as log_file:
+        for line_number, line in enumerate(log_file, 1):
+            line = line.rstrip("\r\n")
+            parsed = LOG_LINE_PATTERN.search(line)
+            if not parsed:
+                handle_malformed_line(errors, file_path, line_number, line)
+                continue
+            store.append(*parsed.groups())
+    return store
+
+def merge_results(results: Iterable[Tuple[dict, list, Union[MalformedLines, None]]],
+                  errors: Union[MalformedLines, None] = None,
+                  continuous: bool = True) -> Tuple[dict, list]:
+    """Merge partial counts and filtered entries, keeping the order of the parts.
+
+    Args:
+        results (Iterable[Tuple[dict, list, Union[MalformedLines, None]]]): Partial counts,
+            filtered entries and statistics of malformed lines, in file order.
+        errors (Union[MalformedLines, None]): Statistics to merge malformed lines into.
+        continuous (bool): True if the parts are consecutive ranges of one file, so line
+            numbers of each part are shifted by the number of lines before it.
+
+    Returns:
+        Tuple[dict, list]: Counts of each log level and the list of matching log entries.
+    """
+    counts = {}
+    filtered = []
+    line_shift = 0
+    for part_counts, part_filtered, part_errors in results:
+        for key, value in part_counts.items():
+            counts[key] = counts.get(key, 0) + value
+        filtered.extend(part_filtered)
+        if part_errors is not None:
+            errors.merge(part_errors, line_shift)
+        if continuous:
+            line_shift += sum(part_counts.values()) + (part_errors.count if part_errors else 0)
+    return counts, filtered
+
+def split_log_file(file_path: str, workers: int) -> List[Tuple[int, int]]:
+    """Split a log file into byte ranges aligned to line boundaries.
+
+    Args:
+        file_path (str): The path to the log file.
+        workers (int): The desired number of ranges.
+
+    Returns:
+        List[Tuple[int, int]]: Non-empty (start, end) byte ranges covering the whole file,
+        each one starting at the beginning of a line.
+    """
+    size = os.path.getsize(file_path)
+    bounds = [0]
+    with open(file_path, "rb") as log_file:
+        for i in range(1, workers):
+            position = size * i // workers
+            if position <= bounds[-1]:
+                continue
+            # Moving to the start of the next line
+            log_file.seek(position - 1)
+            log_file.readline()
+            bounds.append(log_file.tell())
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+def load_logs_range(file_path: str, start: int, end: int,
+                    errors: Union[MalformedLines, None] = None) -> Iterator[dict]:
+    """Lazily load and parse log entries from a byte range of a file.
+
+    Args:
+        file_path (str): The path to the log file.
+        start (int): Offset of the beginning of the first line of the range.
+        end (int): Offset of the end of the range. Lines starting before it are included.
+        errors (Union[MalformedLines, None]): Statistics of malformed lines for
+            tolerant mode, or None for strict mode. Line numbers are counted
+            from the beginning of the range.
+
+    Yields:
+        Iterator[dict]: Dictionaries representing the parsed log entries.
+
+    Raises:
+        ValueError: If a line of the log has incorrect format in strict mode, or if
+            there are too many of them in tolerant mode.
+    """
+    position = start
+    with open(file_path, "rb") as log_file:
+        log_file.seek(start)
+        for line_number, raw_line in enumerate(log_file, 1):
+            if position >= end:
+                break
+            position += len(raw_line)
+            line = raw_line.decode("utf-8").rstrip("\r\n")
+            parsed_line = parse_log_line(line)
+            if not parsed_line:
+                handle_malformed_line(errors, file_path, line_number, line)
+                continue
+            yield parsed_line
+
+def _process_chunk(task: Tuple[str, int, int, Union[str, bool], Union[MalformedLines, None]]
+                   ) -> Tuple[dict, list, Union[MalformedLines, None]]:
+    """Count and filter log entries inside a single byte range of a log file.
+
+    Args:
+        task (Tuple[str, int, int, Union[str, bool], Union[MalformedLines, None]]): The path
+            to the log file, start and end offsets of the range, the log level to filter by
+            and empty statistics of malformed lines for tolerant mode.
+
+    Returns:
+        Tuple[dict, list, Union[MalformedLines, None]]: Counts of each log level, the list
+        of matching log entries and statistics of malformed lines.
+    """
+    file_path, start, end, level, errors = task
+    counts, filtered = count_and_filter_logs(load_logs_range(file_path, start, end, errors),
+                                             level)
+    return counts, filtered, errors
+
+def count_and_filter_logs_parallel(file_path: str, level: Union[str, bool], workers: int,
+                                   errors: Union[MalformedLines, None] = None
+                                   ) -> Tuple[dict, list]:
+    """Count log levels and filter log entries using several processes.
+
+    The file is split into line-aligned byte ranges which are parsed by worker
+    processes. Partial results are merged in file order, so the output is the same
+    as the one of `count_and_filter_logs` over `load_logs`.
+
+    Args:
+        file_path (str): The path to the log file.
+        level (Union[str, bool]): The log level to filter by, or False to skip filtering.
+        workers (int): The number of worker processes.
+        errors (Union[MalformedLines, None]): Statistics of malformed lines for
+            tolerant mode, or None for strict mode.
+
+    Returns:
+        Tuple[dict, list]: Counts of each log level and the list of matching log entries.
+    """
+    chunks = split_log_file(file_path, workers)
+    tasks = [(str(file_path), start, end, level,
+              MalformedLines(errors.limit) if errors is not None else None)
+             for start, end in chunks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return merge_results(executor.map(_process_chunk, tasks), errors)
+
+def _file_signature(file_path: str) -> dict:
+    """Describe the state of a file to check if its index is still valid.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        dict: Size, modification time and a hash of the first and last blocks of the file.
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as log_file:
+        digest.update(log_file.read(INDEX_SAMPLE))
+        if stat.st_size > INDEX_SAMPLE:
+            log_file.seek(max(INDEX_SAMPLE, stat.st_size - INDEX_SAMPLE))
+            digest.update(log_file.read())
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest.hexdigest()}
+
+def build_log_index(file_path: str, tolerant: bool = False) -> Tuple[dict, dict]:
+    """Scan a log file and collect byte offsets of the lines of every log level.
+
+    Args:
+        file_path (str): The path to the log file.
+        tolerant (bool): If True, malformed lines are skipped and their statistics
+            are saved in the header.
+
+    Returns:
+        Tuple[dict, dict]: The index header (file signature, list of levels with
+        their counts and malformed lines) and a dictionary of offset arrays by log level.
+
+    Raises:
+        ValueError: If a line of the log has incorrect format and `tolerant` is False.
+    """
+    header = _file_signature(file_path)
+    errors = MalformedLines() if tolerant else None
+    offsets = {}
+    position = 0
+    with open(file_path, "rb") as log_file:
+        for line_number, raw_line in enumerate(log_file, 1):
+            line = raw_line.decode("utf-8").rstrip("\r\n")
+            parsed_line = parse_log_line(line)
+            if parsed_line:
+                offsets.setdefault(parsed_line['level'], array('Q')).append(position)
+            else:
+                handle_malformed_line(errors, file_path, line_number, line)
+            position += len(raw_line)
+    header['levels'] = [[level, len(level_offsets)] for level, level_offsets in offsets.items()]
+    header['malformed'] = {'count': errors.count if errors else 0,
+                           'samples': errors.samples if errors else []}
+    return header, offsets
+
+def write_log_index(file_path: str, header: dict, offsets: dict) -> None:
+    """Save the index of a log file next to it, in a file with `.idx` suffix.
+
+    The index consists of a JSON header line followed by the offset arrays of
+    all levels, in the order of the levels in the header. Errors are ignored,
+    as the index is only a cache.
+
+    Args:
+        file_path (str): The path to the log file.
+        header (dict): The index header.
+        offsets (dict): Offset arrays by log level.
+    """
+    index_path = f'{file_path}{INDEX_SUFFIX}'
+    temp_path = f'{index_path}.tmp'
+    try:
+        with open(temp_path, "wb") as index_file:
+            index_file.write(json.dumps(header).encode("utf-8") + b'\n')
+            for level, _ in header['levels']:
+                offsets[level].tofile(index_file)
+        os.replace(temp_path, index_path)
+    except OSError:
+        pass
+
+def load_log_index(file_path: str) -> Union[dict, None]:
+    """Read the header of the index of a log file.
+
+    Args:
+        file_path (str): The path to the log file.
+
+    Returns:
+        Union[dict, None]: The index header, or None if there is no index or it
+        doesn't match the current state of the log file.
+    """
+    try:
+        with open(f'{file_path}{INDEX_SUFFIX}', "rb") as index_file:
+            header = json.loads(index_file.readline())
+            header['data_start'] = index_file.tell()
+    except (OSError, ValueError):
+        return None
+    signature = _file_signature(file_path)
+    if any(header.get(key) != value for key, value in signature.items()):
+        return None
+    return header
+
+def read_level_offsets(file_path: str, header: dict, level: str) -> Iterator[int]:
+    """Read offsets of the lines with the given log level from the index. Case-insensitive.
+
+    Args:
+        file_path (str): The path to the log file.
+        header (dict): The index header returned by `load_log_index`.
+        level (str): The log level.
+
+    Returns:
+        Iterator[int]: Sorted byte offsets of the matching lines.
+    """
+    item_size = array('Q').itemsize
+    position = header['data_start']
+    parts = []
+    with open(f'{file_path}{INDEX_SUFFIX}', "rb") as index_file:
+        for level_name, count in header['levels']:
+            if level_name.lower() == level:
+                index_file.seek(position)
+                level_offsets = array('Q')
+                level_offsets.fromfile(index_file, count)
+                parts.append(level_offsets)
+            position += count * item_size
+    return heapq.merge(*parts)
+
+def count_and_filter_logs_indexed(file_path: str, level: Union[str, bool],
+                                  errors: Union[MalformedLines, None] = None
+                                  ) -> Tuple[dict, list]:
+    """Count log levels and filter log entries using the index of the log file.
+
+    The index is built and saved on the first call. Later calls take counts
+    directly from the index and read only the lines with the requested level.
+    Malformed lines are kept in the index too, so they are reported without
+    rescanning the file.
+
+    Args:
+        file_path (str): The path to the log file.
+        level (Union[str, bool]): The log level to filter by, or False to skip filtering.
+        errors (Union[MalformedLines, None]): Statistics of malformed lines for
+            tolerant mode, or None for strict mode.
+
+    Returns:
+        Tuple[dict, list]: Counts of each log level and the list of matching log entries.
+
+    Raises:
+        ValueError: If the log has lines with incorrect format in strict mode, or
+            too many of them in tolerant mode.
+    """
+    header = load_log_index(file_path)
+    if header is None:
+        header, offsets = build_log_index(file_path, tolerant=errors is not None)
+        write_log_index(file_path, header, offsets)
+        parts = [offsets[name] for name in offsets if level and name.lower() == level]
+        line_offsets = heapq.merge(*parts)
+    elif level:
+        line_offsets = read_level_offsets(file_path, header, level)
+    else:
+        line_offsets = []
+    malformed = MalformedLines()
+    malformed.count = header.get('malformed', {}).get('count', 0)
+    malformed.samples = [tuple(sample) for sample in header.get('malformed', {}).get('samples', [])]
+    if malformed.count:
+        if errors is None:
+            raise ValueError('Wrong data format.')
+        errors.merge(malformed)
+    counts = dict(header['levels'])
+    filtered = []
+    with open(file_path, "rb") as log_file:
+        for offset in line_offsets:
+            log_file.seek(offset)
+            filtered.append(parse_log_line(log_file.readline().decode("utf-8").rstrip("\r\n")))
+    return counts, filtered
+
+def expand_log_paths(pattern: str) -> List[Path]:
+    """Find log files by a path, a directory or a glob pattern.
+
+    Files are sorted by name, with numbers compared by value, so rotated logs
+    come in the order 'app.log', 'app.log.1.gz', 'app.log.2.gz', ..., 'app.log.10.gz'.
+
+    Args:
+        pattern (str): A path to a file or a directory, or a glob pattern.
+
+    Returns:
+        List[Path]: The found log files.
+
+    Raises:
+        FileNotFoundError: If no files were found.
+    """
+    path = Path(pattern)
+    if path.is_dir():
+        paths = [item for item in path.iterdir()
+                 if item.is_file() and not item.name.startswith('.')
+                 and not item.name.endswith(INDEX_SUFFIX)]
+    elif path.exists():
+        return [path]
+    else:
+        paths = [Path(item) for item in glob.glob(pattern) if Path(item).is_file()]
+    if not paths:
+        raise FileNotFoundError(pattern)
+    return sorted(paths, key=lambda item: [int(part) if part.isdigit() else part
+                                           for part in re.split(r'(\d+)', item.name)])
+
+def _process_file(task: Tuple[str, Union[str, bool], Union[MalformedLines, None]]
+                  ) -> Tuple[dict, list, Union[MalformedLines, None]]:
+    """Count and filter log entries of a single, possibly compressed, log file.
+
+    Args:
+        task (Tuple[str, Union[str, bool], Union[MalformedLines, None]]): The path to
+            the log file, the log level to filter by and empty statistics of malformed
+            lines for tolerant mode.
+
+    Returns:
+        Tuple[dict, list, Union[MalformedLines, None]]: Counts of each log level, the list
+        of matching log entries and statistics of malformed lines.
+    """
+    file_path, level, errors = task
+    counts, filtered = count_and_filter_logs(load_logs(file_path, errors), level)
+    return counts, filtered, errors
+
+def count_and_filter_logs_files(paths: List[Path], level: Union[str, bool],
+                                workers: int = 1,
+                                errors: Union[MalformedLines, None] = None
+                                ) -> Tuple[dict, list]:
+    """Count log levels and filter log entries of several files as one log.
+
+    Files are processed concurrently by up to `workers` processes and the results
+    are merged in the order of `paths`.
+
+    Args:
+        paths (List[Path]): The paths to the log files.
+        level (Union[str, bool]): The log level to filter by, or False to skip filtering.
+        workers (int): The number of worker processes.
+        errors (Union[MalformedLines, None]): Statistics of malformed lines for
+            tolerant mode, or None for strict mode.
+
+    Returns:
+        Tuple[dict, list]: Counts of each log level and the list of matching log entries.
+    """
+    tasks = [(str(path), level, MalformedLines(errors.limit) if errors is not None else None)
+             for path in paths]
+    if workers <= 1:
+        return merge_results(map(_process_file, tasks), errors, continuous=False)
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        return merge_results(executor.map(_process_file, tasks), errors, continuous=False)
+
+def find_line_offset(file_path: str, moment: str, tolerant: bool = False) -> int:
+    """Find the first log line written at or after the given moment with binary search.
+
+    Log files are written in chronological order, so the offset is found with
+    O(log n) seeks, without reading the whole file.
+
+    Args:
+        file_path (str): The path to the log file.
+        moment (str): The moment in the format 'YYYY-MM-DD HH:MM:SS', or its prefix.
+        tolerant (bool): If True, malformed lines met while probing are skipped.
+
+    Returns:
+        int: Offset of the beginning of the found line, or the size of the file
+        if all the lines were written before the moment.
+
+    Raises:
+        ValueError: If a probed line of the log has incorrect format and `tolerant`
+            is False.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as log_file:
+
+        def line_start(position: int) -> int:
+            if position == 0:
+                return 0
+            log_file.seek(position - 1)
+            log_file.readline()
+            return log_file.tell()
+
+        def is_after(position: int) -> bool:
+            offset = line_start(position)
+            if offset >= size:
+                return True
+            log_file.seek(offset)
+            for raw_line in log_file:
+                parsed_line = parse_log_line(raw_line.decode("utf-8").rstrip("\r\n"))
+                if parsed_line:
+                    return f"{parsed_line['date']} {parsed_line['time']}" >= moment
+                if not tolerant:
+                    raise ValueError('Wrong data format.')
+            return True
+
+        low, high = 0, size
+        while low < high:
+            middle = (low + high) // 2
+            if is_after(middle):
+                high = middle
+            else:
+                low = middle + 1
+        return line_start(low)
+
+def count_and_filter_logs_by_time(file_path: str, level: Union[str, bool],
+                                  time_from: Union[str, None],
+                                  time_to: Union[str, None],
+                                  errors: Union[MalformedLines, None] = None
+                                  ) -> Tuple[dict, list]:
+    """Count log levels and filter log entries written within a time range.
+
+    The borders of the range are found with binary search and only the lines
+    inside of it are parsed.
+
+    Args:
+        file_path (str): The path to the log file.
+        level (Union[str, bool]): The log level to filter by, or False to skip filtering.
+        time_from (Union[str, None]): Beginning of the range, or None for the beginning
+            of the file.
+        time_to (Union[str, None]): End of the range, inclusive, or None for the end
+            of the file. If only a prefix is given (e.g. a date), all the moments
+            starting with it are included.
+        errors (Union[MalformedLines, None]): Statistics of malformed lines for
+            tolerant mode, or None for strict mode. Line numbers are counted from
+            the beginning of the range.
+
+    Returns:
+        Tuple[dict, list]: Counts of each log level and the list of matching log entries.
+    """
+    tolerant = errors is not None
+    start = find_line_offset(file_path, time_from, tolerant) if time_from else 0
+    if time_to:
+        end = find_line_offset(file_path, time_to + '\uffff', tolerant)
+    else:
+        end = os.path.getsize(file_path)
+    return count_and_filter_logs(load_logs_range(file_path, start, end, errors), level)
+
+def follow_log_counts(file_path: str, interval: float = 0.2,
+                      errors: Union[MalformedLines, None] = None) -> Iterator[dict]:
+    """Follow a growing log file and keep counts of log levels up to date.
+
+    Only newly appended bytes are read and parsed, like `tail -f` does. If the file
+    is truncated, it is read again from the beginning; if it is rotated (replaced
+    by a new file), the new file is opened. Counts keep accumulating in both cases.
+
+    Args:
+        file_path (str): The path to the log file.
+        interval (float): Delay in seconds between checks for new data.
+        errors (Union[MalformedLines, None]): Statistics of malformed lines for
+            tolerant mode, or None for strict mode. Line numbers are counted from
+            the beginning of the current file.
+
+    Yields:
+        Iterator[dict]: Updated counts of each log level, every time they change.
+
+    Raises:
+        ValueError: If a line of the log has incorrect format in strict mode, or if
+            there are too many of them in tolerant mode.
+    """
+    counts = {}
+    log_file = open(file_path, "rb")
+    pending = b''
+    line_number = 0
+    try:
+        changed = False
+        while True:
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                # File is being rotated, the new one isn't created yet
+                stat = None
+            same_file = stat is None or stat.st_ino == os.fstat(log_file.fileno()).st_ino
+            if same_file and stat is not None and stat.st_size < log_file.tell():
+                log_file.seek(0)
+                pending = b''
+                line_number = 0
+            # Reading the appended data, including the rest of a rotated file
+            while block := log_file.read(FOLLOW_BLOCK):
+                *lines, pending = (pending + block).split(b'\n')
+                for raw_line in lines:
+                    line_number += 1
+                    line = raw_line.decode("utf-8").rstrip("\r")
+                    parsed_line = parse_log_line(line)
+                    if not parsed_line:
+                        handle_malformed_line(errors, file_path, line_number, line)
+                        changed = True
+                        continue
+                    counts[parsed_line['level']] = counts.get(parsed_line['level'], 0) + 1
+                    changed = True
+            if not same_file:
+                log_file.close()
+                log_file = open(file_path, "rb")
+                pending = b''
+                line_number = 0
+                continue
+            if changed:
+                yield counts
+                changed = False
+            time.sleep(interval)
+    finally:
+        log_file.close()
+
 def display_log_counts(counts: dict) -> None:
     """Display log level counts in a tabular format.
 
@@ -131,7 +958,7 @@ def display_log_counts(counts: dict) -> None:
             f"{Fore.CYAN}{str(counts[key]).rjust(3, ' ')}"
         )
 
-def display_log_by_level(level_log: dict, level: str) -> None:
+def display_log_by_level(level_log: Iterable[dict], level: str) -> None:
     """Display log details for a specific log level.
 
     This function takes a dictionary containing log entries and displays log details
@@ -141,7 +968,7 @@ def display_log_by_level(level_log: dict, level: str) -> None:
         - It uses Colorama for colored output.
 
     Args:
-        level_log (dict): A dictionary containing log entries, where each entry is represented
+        level_log (Iterable[dict]): Log entries, where each entry is represented
                             as a dictionary with keys: 'date', 'time', 'level', and 'message'.
         level (str): The log level for which log details are to be displayed.
     """
@@ -152,6 +979,87 @@ def display_log_by_level(level_log: dict, level: str) -> None:
             f"- {Fore.CYAN}{line['message']}"
         )
 
+def display_malformed_lines(errors: MalformedLines) -> None:
+    """Display statistics of log lines with incorrect format.
+
+    Args:
+        errors (MalformedLines): Statistics of malformed lines.
+    """
+    print(f"{Fore.RED}{'Malformed lines'.ljust(20, ' ')}{Fore.WHITE}|"
+          f"{Fore.RED}{str(errors.count).rjust(3, ' ')}")
+    for source, line_number, line in errors.samples:
+        print(f"{Fore.YELLOW}{source}:{line_number} {Fore.WHITE}- {Fore.CYAN}{line}")
+    if errors.count > len(errors.samples):
+        print(f"{Fore.WHITE}... and {errors.count - len(errors.samples)} more")
+
+def follow(file_path: str, interval: float,
+           errors: Union[MalformedLines, None] = None) -> None:
+    """Display log level counts of a growing log file until interrupted.
+
+    Args:
+        file_path (str): The path to the log file.
+        interval (float): Delay in seconds between checks for new data.
+        errors (Union[MalformedLines, None]): Statistics of malformed lines for
+            tolerant mode, or None for strict mode.
+    """
+    try:
+        for counts in follow_log_counts(file_path, interval, errors):
+            # Clearing the terminal before redrawing the table
+            print('\033[2J\033[H', end='')
+            display_log_counts(counts)
+            if errors is not None and errors.count:
+                display_malformed_lines(errors)
+    except FileNotFoundError:
+        print(f'{Fore.RED}File not found.')
+    except ValueError as error:
+        print(f'{Fore.RED}{error}')
+    except KeyboardInterrupt:
+        pass
+
+def moment(value: str) -> str:
+    """Validate a date-time command line argument.
+
+    Args:
+        value (str): The argument in the format 'YYYY-MM-DD[ HH:MM[:SS]]'.
+
+    Returns:
+        str: The validated argument.
+    """
+    if not re.fullmatch(r'\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2})?)?', value):
+        raise argparse.ArgumentTypeError("must be in the format 'YYYY-MM-DD[ HH:MM[:SS]]'")
+    return value
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description='Log file analyzer.')
+    parser.add_argument('file_path', nargs='?',
+                        help='path to the log file, a directory or a quoted glob pattern; '
+                             "'.gz', '.bz2' and '.xz' files are decompressed on the fly")
+    parser.add_argument('level', nargs='?', help='log level to display details for')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='number of worker processes (default: 1)')
+    parser.add_argument('-f', '--follow', action='store_true',
+                        help='keep reading the log as it grows and update the counts')
+    parser.add_argument('--interval', type=float, default=0.2,
+                        help='delay in seconds between checks in follow mode (default: 0.2)')
+    parser.add_argument('--from', dest='time_from', type=moment,
+                        help="show only entries written at or after 'YYYY-MM-DD[ HH:MM[:SS]]'")
+    parser.add_argument('--to', dest='time_to', type=moment,
+                        help="show only entries written at or before 'YYYY-MM-DD[ HH:MM[:SS]]'")
+    parser.add_argument('--index', action='store_true',
+                        help="use the index file next to the log, creating it on the first "
+                             "run, to speed up repeated runs on the same file")
+    parser.add_argument('-t', '--tolerant', action='store_true',
+                        help='skip lines with incorrect format and report them')
+    parser.add_argument('--max-errors', type=int,
+                        help='maximum number of lines with incorrect format to skip '
+                             '(implies --tolerant, default: unlimited)')
+    return parser.parse_intermixed_args()
+
 def main():
     """
     This function serves as the entry point of the program. It loads log data
@@ -159,27 +1067,59 @@ def main():
     displays log details for a specific log level.
 
     """
-    log_level = False
+    args = parse_args()
     # Trying if path to file is present
-    try:
-        file_path = Path(f'{sys.argv[1]}')
-
-    except IndexError:
+    if not args.file_path:
         print(f'{Fore.RED}No path to folder')
         return
-    # Trying if log level arg is present
+    log_level = args.level.lower() if args.level else False
     try:
-        log_level = sys.argv[2].lower() if (len(sys.argv) > 1) else False
-    except IndexError:
-        pass
-    # parsing pile
-    log = load_logs(file_path)
+        paths = expand_log_paths(args.file_path)
+    except FileNotFoundError:
+        print(f'{Fore.RED}File not found.')
+        return
+    file_path = paths[0]
+    single = len(paths) == 1 and not is_compressed(file_path)
+    if not single and (args.follow or args.time_from or args.time_to):
+        print(f'{Fore.RED}Follow mode and time range need a single uncompressed file.')
+        return
+    errors = None
+    if args.tolerant or args.max_errors is not None:
+        errors = MalformedLines(args.max_errors)
+    if args.follow:
+        follow(file_path, args.interval, errors)
+        return
+    # Parsing file
+    try:
+        if not single:
+            counts, level_log = count_and_filter_logs_files(paths, log_level, args.workers,
+                                                            errors)
+        elif args.time_from or args.time_to:
+            counts, level_log = count_and_filter_logs_by_time(file_path, log_level,
+                                                              args.time_from, args.time_to,
+                                                              errors)
+        elif args.workers > 1:
+            counts, level_log = count_and_filter_logs_parallel(file_path, log_level,
+                                                               args.workers, errors)
+        elif args.index:
+            counts, level_log = count_and_filter_logs_indexed(file_path, log_level, errors)
+        elif log_level:
+            counts, level_log = count_and_filter_logs(load_logs(file_path, errors), log_level)
+        else:
+            counts = count_logs_by_level_fast(file_path, errors)
+    except FileNotFoundError:
+        print(f'{Fore.RED}File not found.')
+        return
+    except ValueError as error:
+        print(f'{Fore.RED}{error}')
+        return
     # Displaying statistic
-    if log:
-        display_log_counts(count_logs_by_level(log))
+    display_log_counts(counts)
+    if errors is not None and errors.count:
+        display_malformed_lines(errors)
     # Displaying details
     if log_level:
-        display_log_by_level(filter_logs_by_level(log, log_level), log_level)
+        display_log_by_level(level_log, log_level)
 
 
 if __name__ == '__main__':
@@ -1,7 +1,13 @@
 """Imports"""
+import argparse
+import os
 import re
 import json
+import sys
+import threading
+import time
 from pathlib import Path
+from typing import Callable, Iterable, List, Tuple
 import colorama
 from colorama import Fore
 colorama.init(autoreset=True)
@@ -119,13 +125,65 @@ def read_file(database) -> dict:
 def write_file(database, contacts_dict: dict) -> None:
     """Writes the given dictionary of contacts to a JSON file named "contacts.json".
 
+    The file is written to a temporary file first, flushed to disk and renamed
+    over the old one, so a crash leaves either the old or the new contacts.
+
     Args:
         contacts_dict (dict): A dictionary representing the contacts, with
         names as keys and phone numbers as values.
     """
     contacts_string = json.dumps(contacts_dict, indent=2)
-    with open(database, "w", encoding="utf-8") as contacts_json:
+    temp_path = Path(database).with_name(Path(database).name + '.tmp')
+    with open(temp_path, "w", encoding="utf-8") as contacts_json:
         contacts_json.write(contacts_string)
+        contacts_json.flush()
+        os.fsync(contacts_json.fileno())
+    os.replace(temp_path, database)
+
+class WriteBehind:
+    """Background thread calling `flush` when the contacts have unsaved changes.
+
+    Changes are reported with `changed`, which never touches the disk. They are
+    flushed after `interval` seconds, or at once when there are `max_changes` of
+    them, whatever comes first.
+    """
+
+    def __init__(self, flush: Callable[[], None], interval: float = 1.0,
+                 max_changes: int = 100) -> None:
+        self.flush = flush
+        self.interval = interval
+        self.max_changes = max_changes
+        self.changes = 0
+        self._stopped = False
+        self._wakeup = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    def changed(self, count: int = 1) -> None:
+        """Count changes of the contacts, waking the flusher up if there are enough of them."""
+        with self._wakeup:
+            self.changes += count
+            if self.changes >= self.max_changes:
+                self._wakeup.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                self._wakeup.wait_for(
+                    lambda: self._stopped or self.changes >= self.max_changes, self.interval)
+                changes, self.changes = self.changes, 0
+                stopped = self._stopped
+            if changes:
+                self.flush()
+            if stopped:
+                return
+
+    def stop(self) -> None:
+        """Flush the last changes and stop the thread."""
+        with self._wakeup:
+            self._stopped = True
+            self._wakeup.notify()
+        self._thread.join()
 
 @validate_two_args
 @check_contact_exists
@@ -213,6 +271,82 @@ def phone_line(name: str, phone: str) -> str:
     """
     return f"{Fore.GREEN}{name.ljust(30, '.')}{Fore.CYAN}{phone}\n"
 
+# Batch mode
+BATCH_COMMANDS = {
+    'add': add_contact,
+    'change': change_contact,
+    'del': delete_contact,
+    'phone': show_phone,
+    'all': lambda contacts, args: show_all(contacts),
+    'hello': lambda contacts, args: 'How can I help you?',
+    'help': lambda contacts, args: commands_help(),
+}
+ANSI_CODE = re.compile(r'\x1b\[[0-9;]*m')
+
+def run_batch(contacts: dict, lines: Iterable[str]) -> Tuple[List[str], dict]:
+    """Run the commands of a script against the contacts.
+
+    Commands are the same as in the interactive mode; empty lines and lines
+    starting with '#' are skipped, 'close' or 'exit' stops the script.
+    A command fails if its handler answers with an error message (red line).
+
+    Args:
+        contacts (dict): A dictionary containing contacts base.
+        lines (Iterable[str]): Lines of the script.
+
+    Returns:
+        Tuple[List[str], dict]: Outputs of the commands and the summary: numbers of
+        commands, successes and failures, the failures with their line numbers and
+        errors, and the time spent.
+    """
+    outputs = []
+    failures = []
+    commands = 0
+    start = time.perf_counter()
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        command, *args = parse_input(line)
+        if command in ('close', 'exit'):
+            break
+        commands += 1
+        handler = BATCH_COMMANDS.get(command)
+        output = handler(contacts, args) if handler else mistaken_arg('invalid command')
+        outputs.append(output)
+        if output.startswith(Fore.RED):
+            failures.append({'line': line_number,
+                             'command': line.strip(),
+                             'error': ' '.join(ANSI_CODE.sub('', output).split())})
+    summary = {
+        'commands': commands,
+        'succeeded': commands - len(failures),
+        'failed': len(failures),
+        'failures': failures,
+        'seconds': round(time.perf_counter() - start, 4),
+    }
+    return outputs, summary
+
+def batch(database: Path, script: str, quiet: bool) -> None:
+    """Run commands from a script file or from stdin ('-') and print a JSON summary.
+
+    The contacts are written to the database once, after the whole script.
+
+    Args:
+        database (Path): The path to the contacts database.
+        script (str): The path to the script, or '-' for stdin.
+        quiet (bool): If True, only the summary is printed.
+    """
+    contacts = read_file(database)
+    if script == '-':
+        outputs, summary = run_batch(contacts, sys.stdin)
+    else:
+        with open(script, "r", encoding="utf-8") as script_file:
+            outputs, summary = run_batch(contacts, script_file)
+    write_file(database, contacts)
+    if not quiet and outputs:
+        sys.stdout.write('\n'.join(outputs) + '\n')
+    print(json.dumps(summary))
+
 # Main block
 def main():
     """This code is designed to create a simple command-line interface (CLI)
@@ -221,15 +355,39 @@ def main():
     uses the 'colorama' module to add colors to the output strings for better
     readability.
     """
+    parser = argparse.ArgumentParser(description='Assistant bot for contacts.')
+    parser.add_argument('--batch', metavar='FILE',
+                        help="run commands from the file ('-' for stdin) and exit")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='print only the summary in batch mode')
+    parser.add_argument('--flush-interval', type=float, default=1.0, metavar='SEC',
+                        help='seconds before changes are written to disk (default: 1.0)')
+    parser.add_argument('--flush-changes', type=int, default=100, metavar='N',
+                        help='number of changes written to disk at once, without waiting '
+                             '(default: 100)')
+    args = parser.parse_args()
     database = Path("contacts.json")
+    if args.batch:
+        batch(database, args.batch, args.quiet)
+        return
     contacts = read_file(database)
+    # The copy is taken by the flusher thread, so saving never blocks the commands
+    flusher = WriteBehind(lambda: write_file(database, dict(contacts)),
+                          args.flush_interval, args.flush_changes)
     print(f"\n{Fore.YELLOW}Welcome to the assistant bot!\n(enter 'help' for list of commands)\n")
     while True:
-        user_input = input(f"Enter a command: {Fore.BLUE}")
+        try:
+            user_input = input(f"Enter a command: {Fore.BLUE}")
+        except (KeyboardInterrupt, EOFError):
+            user_input = "exit"
+            print()
+        if not user_input.strip():
+            continue
         command, *args = parse_input(user_input)
 
         match command:
             case "close" | "exit":
+                flusher.stop()
                 write_file(database, contacts)
                 print(f"{Fore.YELLOW}Good bye!\n")
                 break
@@ -239,10 +397,13 @@ def main():
                 print(commands_help())
             case "add":
                 print(f"{Fore.YELLOW}{add_contact(contacts, args)}\n")
+                flusher.changed()
             case "change":
                 print(f"{Fore.YELLOW}{change_contact(contacts, args)}\n")
+                flusher.changed()
             case "del":
                 print(f"{Fore.YELLOW}{delete_contact(contacts, args)}\n")
+                flusher.changed()
             case "phone":
                 print(f"{show_phone(contacts, args)}\n")
             case "all":
@@ -1,11 +1,90 @@
 """Imports"""
+import argparse
+import sys
 from pathlib import Path
-from bot_pkg import parse_input, read_file, write_file, add_contact, \
-                            change_contact, delete_contact, show_phone, \
-                            show_all, mistaken_arg, commands_help
-import colorama
+from bot_pkg import parse_input, read_file, write_file, show_all, mistaken_arg
+from bot_pkg.batch import BATCH_COMMANDS, run_batch
+from bot_pkg.flusher import FLUSH_INTERVAL, FLUSH_CHANGES
 from colorama import Fore
-colorama.init(autoreset=True)
+
+LOCAL_HOST = '127.0.0.1'
+
+def print_pages(contacts, args: tuple) -> None:
+    """Print the list of contacts page by page, as soon as every page is ready."""
+    for page in show_all(contacts, args):
+        print(page, end='')
+    print()
+
+def print_answer(handler):
+    """Make an interactive command of a batch one, printing its answer."""
+    return lambda contacts, args: print(f"{Fore.YELLOW}{handler(contacts, args)}\n")
+
+# The same commands as in the batch mode, only 'all' prints every page once it's ready
+COMMANDS = {command: print_answer(handler) for command, handler in BATCH_COMMANDS.items()}
+COMMANDS['all'] = print_pages
+
+def invalid_command(contacts, args: tuple) -> None:
+    """Print the error message of an unknown command."""
+    print(f"{mistaken_arg('invalid command')}\n")
+
+def batch(database: Path, script: str, quiet: bool) -> None:
+    """Run commands from a script file or from stdin ('-') and print a JSON summary.
+
+    Args:
+        database (Path): The path to the contacts database.
+        script (str): The path to the script, or '-' for stdin.
+        quiet (bool): If True, only the summary is printed.
+    """
+    # Modules needed only in this mode are imported here to keep the startup fast
+    import json
+    contacts = read_file(database)
+    try:
+        if script == '-':
+            outputs, summary = run_batch(contacts, sys.stdin)
+        else:
+            with open(script, "r", encoding="utf-8") as script_file:
+                outputs, summary = run_batch(contacts, script_file)
+    finally:
+        write_file(database, contacts)
+    if not quiet and outputs:
+        sys.stdout.write('\n'.join(outputs) + '\n')
+    print(json.dumps(summary))
+
+def address(value: str) -> tuple:
+    """Parse a '[HOST:]PORT' command line argument.
+
+    Without a host only local clients can connect; listening on other interfaces
+    takes an explicit host, e.g. '0.0.0.0:8000'.
+
+    Returns:
+        tuple: The host and the port.
+    """
+    host, _, port = value.rpartition(':')
+    if not port.isdigit():
+        raise argparse.ArgumentTypeError("must look like '[HOST:]PORT'")
+    return host or LOCAL_HOST, int(port)
+
+def server(database: Path, tcp: tuple, unix: str) -> None:
+    """Serve the contacts database to many clients until interrupted with Ctrl+C.
+
+    Args:
+        database (Path): The path to the contacts database.
+        tcp (tuple): The host and the port to listen on, if `unix` is not given.
+        unix (str): The path of the Unix socket to listen on.
+    """
+    import asyncio
+    from bot_pkg.server import serve
+    contacts = read_file(database)
+    host, port = tcp or (None, None)
+    where = unix or f"{host}:{port}"
+    print(f"{Fore.YELLOW}Serving contacts on {where} (Ctrl+C to stop)")
+    try:
+        asyncio.run(serve(contacts, host, port, unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        write_file(database, contacts)
+    print(f"{Fore.YELLOW}Good bye!\n")
 
 def main():
     """This code is designed to create a simple command-line interface (CLI)
@@ -14,34 +93,48 @@ def main():
     uses the 'colorama' module to add colors to the output strings for better
     readability.
     """
-    database = Path("bot_pkg/contacts.json")
-    contacts = read_file(database)
+    parser = argparse.ArgumentParser(description='Assistant bot for contacts.')
+    parser.add_argument('--batch', metavar='FILE',
+                        help="run commands from the file ('-' for stdin) and exit")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='print only the summary in batch mode')
+    parser.add_argument('--flush-interval', type=float, default=FLUSH_INTERVAL, metavar='SEC',
+                        help='seconds before changes are written to disk in the interactive '
+                             f'mode (default: {FLUSH_INTERVAL})')
+    parser.add_argument('--flush-changes', type=int, default=FLUSH_CHANGES, metavar='N',
+                        help='number of changes written to disk at once, without waiting '
+                             f'(default: {FLUSH_CHANGES})')
+    parser.add_argument('--serve', metavar='[HOST:]PORT', type=address,
+                        help='serve the commands over TCP to many clients; the host is '
+                             f'{LOCAL_HOST} unless given, e.g. 0.0.0.0:8000 for all interfaces')
+    parser.add_argument('--unix', metavar='PATH',
+                        help='serve the commands over a Unix socket')
+    args = parser.parse_args()
+    database = Path("bot_pkg/contacts.db")
+    if args.batch:
+        batch(database, args.batch, args.quiet)
+        return
+    if args.serve or args.unix:
+        server(database, args.serve, args.unix)
+        return
+    contacts = read_file(database, args.flush_interval, args.flush_changes)
     print(f"\n{Fore.YELLOW}Welcome to the assistant bot!\n(enter 'help' for list of commands)\n")
     while True:
-        user_input = input(f"Enter a command: {Fore.BLUE}")
+        try:
+            user_input = input(f"Enter a command: {Fore.BLUE}")
+        except (KeyboardInterrupt, EOFError):
+            user_input = "exit"
+            print()
+        if not user_input.strip():
+            continue
         command, *args = parse_input(user_input)
-
-        match command:
-            case "close" | "exit":
-                write_file(database, contacts)
-                print(f"{Fore.YELLOW}Good bye!\n")
-                break
-            case "hello":
-                print(f"{Fore.YELLOW}How can I help you?\n")
-            case "help":
-                print(commands_help())
-            case "add":
-                print(f"{Fore.YELLOW}{add_contact(contacts, args)}\n")
-            case "change":
-                print(f"{Fore.YELLOW}{change_contact(contacts, args)}\n")
-            case "del":
-                print(f"{Fore.YELLOW}{delete_contact(contacts, args)}\n")
-            case "phone":
-                print(f"{show_phone(contacts, args)}\n")
-            case "all":
-                print(show_all(contacts))
-            case _:
-                print(f"{mistaken_arg('invalid command')}\n")
+        if command in ("close", "exit"):
+            write_file(database, contacts)
+            print(f"{Fore.YELLOW}Good bye!\n")
+            break
+        COMMANDS.get(command, invalid_command)(contacts, args)
+        if (error := contacts.flush_error()) is not None:
+            print(f"{mistaken_arg('not saved')} ({error})\n")
 
 
 if __name__ == "__main__":
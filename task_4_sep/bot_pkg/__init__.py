@@ -1,24 +1,36 @@
 """imports"""
-from bot_pkg.process import parse_input, read_file, write_file, add_contact, \
-                            change_contact, delete_contact, show_phone, \
-                            show_all, phone_line
-from bot_pkg.decor import read_file_check, validate_two_args, validate_one_arg, \
-                            check_contact_exists
-from bot_pkg.colors import mistaken_arg, commands_help
+from importlib import import_module
 
-__all__ = ['parse_input',
-            'read_file',
-            'write_file',
-            'add_contact',
-            'change_contact',
-            'delete_contact',
-            'show_phone',
-            'show_all',
-            'phone_line',
-            'read_file_check',
-            'validate_two_args',
-            'validate_one_arg',
-            'check_contact_exists',
-            'mistaken_arg',
-            'commands_help'
-            ]
+# Submodules are imported on the first access to their names, so importing the
+# package doesn't load e.g. asyncio for the server when it isn't used
+_EXPORTS = {
+    'process': ['parse_input', 'read_file', 'write_file', 'add_contact', 'change_contact',
+                'delete_contact', 'show_phone', 'show_all', 'phone_line', 'find_contact',
+                'find_by_phone', 'import_file', 'export_file'],
+    'decor': ['read_file_check', 'validate_two_args', 'validate_one_arg',
+              'check_contact_exists', 'validate_search_arg', 'validate_phone_arg',
+              'validate_file_arg'],
+    'colors': ['mistaken_arg', 'commands_help'],
+    'storage': ['ContactBook'],
+    'mapped': ['MappedContacts', 'convert_json'],
+    'search': ['NameIndex', 'get_name_index', 'PhoneIndex', 'get_phone_index',
+               'normalize_phone'],
+    'batch': ['run_batch'],
+    'bulk': ['read_rows', 'validate_batch', 'import_contacts', 'export_contacts'],
+    'server': ['execute', 'handle_client', 'serve'],
+    'flusher': ['WriteBehind', 'atomic_write'],
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+def __getattr__(name: str):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'{__name__}.{module}'), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
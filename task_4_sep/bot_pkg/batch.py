@@ -0,0 +1,78 @@
+"""Imports"""
+import re
+import time
+from contextlib import nullcontext
+from typing import Iterable, List, Tuple
+from bot_pkg.process import parse_input, add_contact, change_contact, delete_contact, \
+                            show_phone, show_all, find_contact, find_by_phone, \
+                            import_file, export_file
+from bot_pkg.colors import mistaken_arg, commands_help
+from colorama import Fore
+
+BATCH_COMMANDS = {
+    'add': add_contact,
+    'change': change_contact,
+    'del': delete_contact,
+    'phone': show_phone,
+    'find': find_contact,
+    'search': find_contact,
+    'who': find_by_phone,
+    'import': import_file,
+    'export': export_file,
+    'all': lambda contacts, args: ''.join(show_all(contacts, args)),
+    'hello': lambda contacts, args: 'How can I help you?',
+    'help': lambda contacts, args: commands_help(),
+}
+ANSI_CODE = re.compile(r'\x1b\[[0-9;]*m')
+
+
+def run_batch(contacts, lines: Iterable[str]) -> Tuple[List[str], dict]:
+    """Run the commands of a script against the contacts as one transaction.
+
+    Commands are the same as in the interactive mode; empty lines and lines
+    starting with '#' are skipped, 'close' or 'exit' stops the script. If the book
+    supports transactions, its changes are flushed to disk once, at the end.
+    A command fails if its handler answers with an error message (red line).
+
+    Args:
+        contacts: A dictionary-like object containing contacts base.
+        lines (Iterable[str]): Lines of the script.
+
+    Returns:
+        Tuple[List[str], dict]: Outputs of the commands and the summary: numbers of
+        commands, successes and failures, the failures with their line numbers and
+        errors, and the time spent.
+    """
+    outputs = []
+    failures = []
+    commands = 0
+    start = time.perf_counter()
+    transaction = getattr(contacts, 'transaction', None)
+    with transaction() if transaction else nullcontext():
+        for line_number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line[0] == '#':
+                continue
+            command, *args = parse_input(line)
+            if command in ('close', 'exit'):
+                break
+            commands += 1
+            handler = BATCH_COMMANDS.get(command)
+            output = handler(contacts, args) if handler else mistaken_arg('invalid command')
+            outputs.append(output)
+            if output.startswith(Fore.RED):
+                failures.append({'line': line_number,
+                                 'command': line,
+                                 'error': ' '.join(ANSI_CODE.sub('', output).split())})
+    summary = {
+        'commands': commands,
+        'succeeded': commands - len(failures),
+        'failed': len(failures),
+        'failures': failures,
+        'seconds': round(time.perf_counter() - start, 4),
+    }
+    return outputs, summary
+
+
+if __name__ == "__main__":
+    pass
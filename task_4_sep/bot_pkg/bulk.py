@@ -0,0 +1,175 @@
+"""Imports"""
+import csv
+import json
+from contextlib import nullcontext
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+from bot_pkg.mapped import MAX_NAME_BYTES, MAX_PHONE_BYTES
+from bot_pkg.search import index_added
+
+BULK_BATCH = 10000
+FORMATS = ('.csv', '.jsonl')
+REJECT_FIELDS = ['line', 'name', 'phone', 'reason']
+
+
+def file_format(path) -> str:
+    """Return the format of a bulk file by its extension, or '' if it isn't supported."""
+    suffix = Path(path).suffix.lower()
+    return suffix if suffix in FORMATS else ''
+
+def read_rows(path) -> Iterator[Tuple[int, object, object]]:
+    """Stream the rows of a CSV or JSONL file of contacts.
+
+    A CSV file has the name and the phone number in the first two columns and may
+    start with a 'name,phone' header. A JSONL file has an object with 'name' and
+    'phone' keys on every line. Empty lines are skipped.
+
+    Args:
+        path: The path to the '.csv' or '.jsonl' file.
+
+    Yields:
+        Iterator[Tuple[int, object, object]]: Line number, name and phone number.
+        The name is None if the line can't be parsed.
+    """
+    with open(path, "r", encoding="utf-8", newline='') as bulk_file:
+        if file_format(path) == '.csv':
+            reader = csv.reader(bulk_file)
+            for row in reader:
+                if not row or (reader.line_num == 1 and
+                               [cell.strip().lower() for cell in row[:2]] == ['name', 'phone']):
+                    continue
+                if len(row) != 2:
+                    yield reader.line_num, None, None
+                    continue
+                yield reader.line_num, row[0].strip(), row[1].strip()
+        else:
+            for line_number, line in enumerate(bulk_file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    name, phone = record['name'], record['phone']
+                except (ValueError, TypeError, KeyError):
+                    yield line_number, None, None
+                    continue
+                yield line_number, name, phone
+
+def validate_batch(contacts, rows: List[tuple]) -> Tuple[List[tuple], List[tuple]]:
+    """Check a batch of rows at once with the rules of the 'add' command.
+
+    Names already in the contacts are rejected, as well as the repeated ones: the
+    first row with a name wins. Names of earlier batches are in the contacts by the
+    time the next batch is checked, so only one batch is kept in memory.
+
+    Args:
+        contacts: A dictionary-like object containing contacts base.
+        rows (List[tuple]): Rows returned by `read_rows`.
+
+    Returns:
+        Tuple[List[tuple], List[tuple]]: Accepted (name, phone) pairs and rejected
+        (line, name, phone, reason) rows.
+    """
+    accepted = []
+    rejected = []
+    seen = set()
+    for line_number, name, phone in rows:
+        if not isinstance(name, str) or not isinstance(phone, str) or not name or \
+                len(name.split()) != 1 or len(phone.split()) != 1:
+            reason = 'malformed line'
+        elif len(phone) not in (10, 13) or len(phone.encode("utf-8")) > MAX_PHONE_BYTES:
+            reason = 'invalid phone'
+        elif len(name.encode("utf-8")) > MAX_NAME_BYTES:
+            reason = 'name is too long'
+        elif name in seen:
+            reason = 'duplicate name'
+        else:
+            seen.add(name)
+            accepted.append((line_number, name, phone))
+            continue
+        rejected.append((line_number, name, phone, reason))
+    # Looking up the whole batch in the store in one go, after the in-file checks
+    known = {name for _, name, _ in accepted if name in contacts}
+    if known:
+        rejected.extend((line_number, name, phone, 'contact exists')
+                        for line_number, name, phone in accepted if name in known)
+        rejected.sort()
+    return [(name, phone) for _, name, phone in accepted if name not in known], rejected
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+def import_contacts(contacts, path, rejects_path=None, batch_size: int = BULK_BATCH) -> dict:
+    """Import contacts from a CSV or JSONL file in batches.
+
+    Every batch is validated at once by `validate_batch` and its accepted contacts
+    are merged into the store. If the book supports transactions, each batch is
+    flushed to disk once. Memory use is bounded by the batch size.
+
+    Args:
+        contacts: A dictionary-like object containing contacts base.
+        path: The path to the '.csv' or '.jsonl' file.
+        rejects_path: The path of the CSV file for rejected rows (line, name, phone,
+            reason). By default it is the imported file name plus '.rejects.csv'.
+            It is written only if there are rejected rows.
+        batch_size (int): The number of rows validated at once.
+
+    Returns:
+        dict: Numbers of imported and rejected rows and the path of the rejects file.
+    """
+    rejects_path = Path(rejects_path or f'{path}.rejects.csv')
+    summary = {'imported': 0, 'rejected': 0, 'rejects': None}
+    rejects_file = None
+    writer = None
+    transaction = getattr(contacts, 'transaction', None)
+    try:
+        for batch in _batches(read_rows(path), batch_size):
+            accepted, rejected = validate_batch(contacts, batch)
+            with transaction() if transaction else nullcontext():
+                for name, phone in accepted:
+                    contacts[name] = phone
+                    index_added(contacts, name, phone)
+            summary['imported'] += len(accepted)
+            if rejected:
+                if writer is None:
+                    rejects_file = open(rejects_path, "w", encoding="utf-8", newline='')
+                    writer = csv.writer(rejects_file)
+                    writer.writerow(REJECT_FIELDS)
+                    summary['rejects'] = str(rejects_path)
+                writer.writerows(rejected)
+                summary['rejected'] += len(rejected)
+    finally:
+        if rejects_file is not None:
+            rejects_file.close()
+    return summary
+
+def export_contacts(contacts, path) -> int:
+    """Export the contacts to a CSV (with a 'name,phone' header) or JSONL file.
+
+    Contacts are written as they are iterated, without building the whole file in memory.
+
+    Args:
+        contacts: A dictionary-like object containing contacts base.
+        path: The path of the '.csv' or '.jsonl' file to write.
+
+    Returns:
+        int: The number of exported contacts.
+    """
+    exported = 0
+    with open(path, "w", encoding="utf-8", newline='') as bulk_file:
+        if file_format(path) == '.csv':
+            writer = csv.writer(bulk_file)
+            writer.writerow(['name', 'phone'])
+            for exported, row in enumerate(contacts.items(), 1):
+                writer.writerow(row)
+        else:
+            for exported, (name, phone) in enumerate(contacts.items(), 1):
+                bulk_file.write(json.dumps({'name': name, 'phone': phone},
+                                           ensure_ascii=False) + '\n')
+    return exported
+
+
+if __name__ == "__main__":
+    pass
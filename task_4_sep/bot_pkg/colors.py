@@ -1,6 +1,7 @@
 """Imports"""
 import colorama
 from colorama import Fore
+# The only initialization of colored output, for the modules and the entry script
 colorama.init(autoreset=True)
 
 def mistaken_arg(mistake: str) -> str:
@@ -27,16 +28,42 @@ def mistaken_arg(mistake: str) -> str:
         case 'invalid phone':
             return f"{Fore.RED}Invalid Phone-number.\n{Fore.YELLOW}Must be 10 numbers, " \
                     "or 13 if in international format."
+        case 'invalid name':
+            return f"{Fore.RED}Invalid Name.\n{Fore.YELLOW}Name is too long."
+        case 'nothing found':
+            return f"{Fore.RED}Nothing found.\n{Fore.YELLOW}There are no similar names."
+        case 'no phone for search':
+            return f"{Fore.RED}Invalid data.\n{Fore.YELLOW}You must give me Phone-number."
+        case 'phone not found':
+            return f"{Fore.RED}Nothing found.\n{Fore.YELLOW}This phone-number isn't in contacts."
+        case 'invalid options':
+            return f"{Fore.RED}Invalid options.\n{Fore.YELLOW}Use '--page N', '--size K', " \
+                    "'--sort name|phone' or '--filter TEXT'.\n"
+        case 'no file':
+            return f"{Fore.RED}Invalid data.\n{Fore.YELLOW}You must give me File name."
+        case 'invalid format':
+            return f"{Fore.RED}Invalid File.\n{Fore.YELLOW}Must be '.csv' or '.jsonl' file."
+        case 'file not found':
+            return f"{Fore.RED}Invalid File.\n{Fore.YELLOW}This file doesn't exist."
+        case 'not saved':
+            return f"{Fore.RED}Changes not saved.\n{Fore.YELLOW}Writing to disk failed, " \
+                    "it will be tried again."
         case 'invalid args':
             return f"{Fore.RED}Invalid data.\n{Fore.YELLOW}You must give me Name and Phone-number."
 
 def commands_help() -> str:
     """Returns the list of commands for bot."""
     return "'add [name] [phone]'\tto add new contact(phone must be 10 or 13 digits).\n" \
-            "'all'\t\t\tto review all contacts.\n" \
+            "'all'\t\t\tto review all contacts, options: '--page N', '--size K',\n" \
+            "\t\t\t'--sort name|phone', '--filter TEXT'.\n" \
             "'change [name] [phone]'\tto change contact's phone number.\n" \
             "'del [name]'\t\tto delete contact from list.\n" \
+            "'export [file]'\t\tto save contacts to '.csv' or '.jsonl' file.\n" \
+            "'find [name]'\t\tto search contacts by the beginning of name or similar names.\n" \
+            "'import [file] [rejects]'\n\t\t\tto add contacts from '.csv' or '.jsonl' file,\n" \
+            "\t\t\trejected lines are saved to the rejects file.\n" \
             "'phone [name]'\t\tto review contact's phone number.\n" \
+            "'who [phone]'\t\tto find contacts with the phone number.\n" \
             "'close' or 'exit'\tto exit assistant.\n"
 
 
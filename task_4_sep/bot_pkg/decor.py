@@ -1,5 +1,6 @@
 """Imports"""
 from bot_pkg.colors import mistaken_arg
+from bot_pkg.mapped import MAX_NAME_BYTES, MAX_PHONE_BYTES
 
 def read_file_check(func) -> callable:
     """Decorator to handle file not found errors."""
@@ -16,9 +17,11 @@ def validate_two_args(func):
     def inner(contacts, args):
         if len(args) != 2:
             return mistaken_arg('invalid args')
-        _, phone = args
-        if len(phone) not in [10, 13]:
+        name, phone = args
+        if len(phone) not in [10, 13] or len(phone.encode("utf-8")) > MAX_PHONE_BYTES:
             return mistaken_arg('invalid phone')
+        if len(name.encode("utf-8")) > MAX_NAME_BYTES:
+            return mistaken_arg('invalid name')
         return func(contacts, args)
 
     return inner
@@ -35,6 +38,37 @@ def validate_one_arg(func):
 
     return inner
 
+def validate_search_arg(func):
+    """Decorator to validate search functions with 1 argument."""
+    def inner(contacts, args):
+        if len(args) != 1:
+            return mistaken_arg('no name for search')
+        return func(contacts, args)
+
+    return inner
+
+def validate_phone_arg(func):
+    """Decorator to validate functions with a phone number argument."""
+    def inner(contacts, args):
+        if len(args) != 1:
+            return mistaken_arg('no phone for search')
+        if len(args[0]) not in [10, 13]:
+            return mistaken_arg('invalid phone')
+        return func(contacts, args)
+
+    return inner
+
+def validate_file_arg(func):
+    """Decorator to validate functions with a '.csv' or '.jsonl' file argument."""
+    def inner(contacts, args):
+        if not 1 <= len(args) <= 2:
+            return mistaken_arg('no file')
+        if not args[0].lower().endswith(('.csv', '.jsonl')):
+            return mistaken_arg('invalid format')
+        return func(contacts, args)
+
+    return inner
+
 def check_contact_exists(func):
     """Decorator to check if the contact already exists."""
     def inner(contacts, args):
@@ -0,0 +1,110 @@
+"""Imports"""
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Union
+
+FLUSH_INTERVAL = 1.0
+FLUSH_CHANGES = 100
+
+
+def atomic_write(path, text: str, sync: bool = True) -> None:
+    """Replace a file with the text so that a crash leaves either the old or the new file.
+
+    The text is written to a temporary file next to the target, flushed to disk
+    and renamed over the target; then the directory entry is flushed too.
+
+    Args:
+        path: The path of the file to replace.
+        text (str): The new content of the file.
+        sync (bool): If False, the data is left to the OS to write out (no fsync).
+    """
+    path = Path(path)
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, "w", encoding="utf-8") as temp_file:
+        temp_file.write(text)
+        temp_file.flush()
+        if sync:
+            os.fsync(temp_file.fileno())
+    os.replace(temp_path, path)
+    if sync and hasattr(os, 'O_DIRECTORY'):
+        directory = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+class WriteBehind:
+    """Background thread calling `flush` when a book has unsaved changes.
+
+    The book reports its changes with `changed`, which never touches the disk. The
+    changes are flushed after `interval` seconds, or at once when there are
+    `max_changes` of them, whatever comes first. A failed flush is tried again
+    after `interval` seconds, and its error is kept for `take_error` to report it.
+    The last flush, made by `stop`, raises the error instead.
+    """
+
+    def __init__(self, flush: Callable[[], None], interval: float = FLUSH_INTERVAL,
+                 max_changes: int = FLUSH_CHANGES) -> None:
+        self.flush = flush
+        self.interval = interval
+        self.max_changes = max_changes
+        self.changes = 0
+        self.error = None
+        self._reported = True
+        self._stopped = False
+        self._wakeup = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    def changed(self, count: int = 1) -> None:
+        """Count changes of the book, waking the flusher up if there are enough of them."""
+        with self._wakeup:
+            self.changes += count
+            if self.changes >= self.max_changes:
+                self._wakeup.notify()
+
+    def take_error(self) -> Union[OSError, None]:
+        """Return the error of the last flush if it failed and wasn't reported yet."""
+        if self._reported:
+            return None
+        self._reported = True
+        return self.error
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                # After a failure, the disk gets the whole interval to recover
+                self._wakeup.wait_for(
+                    lambda: self._stopped or (self.error is None
+                                              and self.changes >= self.max_changes),
+                    self.interval)
+                changes, self.changes = self.changes, 0
+                stopped = self._stopped
+            if changes:
+                try:
+                    self.flush()
+                except OSError as error:
+                    self.error, self._reported = error, False
+                    if stopped:
+                        return
+                    with self._wakeup:
+                        self.changes += changes
+                    continue
+                self.error = None
+            if stopped:
+                return
+
+    def stop(self) -> None:
+        """Flush the last changes and stop the thread."""
+        with self._wakeup:
+            self._stopped = True
+            self._wakeup.notify()
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,319 @@
+"""Imports"""
+import json
+import mmap
+import os
+import struct
+import threading
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Union
+from zlib import crc32
+from bot_pkg.flusher import WriteBehind
+
+MAGIC = b'CONTACT2'
+HEADER = struct.Struct('<8sQQQ')
+# The count and deleted fields of the header, the only ones changed by a write
+COUNTS = struct.Struct('<QQ')
+SLOT = struct.Struct('<BBB61s15s')
+MAX_NAME_BYTES = 61
+MAX_PHONE_BYTES = 15
+EMPTY, USED, DELETED = 0, 1, 2
+MIN_CAPACITY = 1024
+MAX_LOAD = 0.7
+FAST_GROWTH = 1 << 18
+
+
+def _create(database: Path, capacity: int) -> None:
+    """Create an empty database file with the given number of slots."""
+    with open(database, "wb") as db_file:
+        db_file.write(HEADER.pack(MAGIC, capacity, 0, 0))
+        db_file.truncate(HEADER.size + capacity * SLOT.size)
+
+
+class MappedContacts(MutableMapping):
+    """Contacts in a hash table of fixed-size slots, memory-mapped from disk.
+
+    Opening the database doesn't read it: a lookup hashes the name and touches only
+    the pages of the probed slots, so startup time doesn't depend on the size of
+    the book. Changes are written into the mapped file in place. Iteration goes
+    in slot order.
+
+    With `flush_interval` set, changed pages are written to disk by a background
+    thread (see `WriteBehind`) instead of right after every change, and so is a
+    table grown to make room for more contacts.
+    """
+
+    def __init__(self, database, sync: bool = True, flush_interval: float = None,
+                 flush_changes: int = None) -> None:
+        self.database = Path(database)
+        self.sync = sync
+        self._lock = threading.Lock()
+        self._flusher = None
+        self._found = (None, None)
+        # Maps of the tables replaced by grown ones, left for the flusher to close
+        self._retired = []
+        # The file of a grown table yet to replace the database in the write-behind mode
+        self._replacing = None
+        if not self.database.exists():
+            _create(self.database, MIN_CAPACITY)
+        self._open()
+        if flush_interval is not None:
+            self.sync = False
+            self._flusher = WriteBehind(self.flush, flush_interval,
+                                        flush_changes or MIN_CAPACITY)
+
+    def _open(self, path: Path = None) -> None:
+        self._file = open(path or self.database, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.capacity, self.count, self.deleted = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'{self.database} is not a contacts database.')
+        # The number of used and deleted slots that makes the table grow
+        self._limit = int(self.capacity * MAX_LOAD)
+
+    def _slot_offset(self, index: int) -> int:
+        return HEADER.size + index * SLOT.size
+
+    def _find(self, name: bytes) -> tuple:
+        """Find the slot of a name.
+
+        Only the state and the name of a probed slot are read, not the whole slot.
+        A command usually looks a name up before changing it, so the last result
+        is kept until the next change of the table.
+
+        Returns:
+            tuple: Index of the slot with the name (or None) and index of the first
+            free slot met while probing, where the name can be inserted.
+        """
+        if name == self._found[0]:
+            return self._found[1]
+        table = self._map
+        capacity = self.capacity
+        size = len(name)
+        # CRC-32 is stable in every process and much cheaper than a cryptographic hash
+        index = crc32(name) % capacity
+        free = None
+        for _ in range(capacity):
+            offset = HEADER.size + index * SLOT.size
+            state = table[offset]
+            if state == EMPTY:
+                found = None, index if free is None else free
+                break
+            if state == DELETED:
+                if free is None:
+                    free = index
+            elif table[offset + 1] == size and table[offset + 3:offset + 3 + size] == name:
+                found = index, free
+                break
+            index += 1
+            if index == capacity:
+                index = 0
+        else:
+            found = None, free
+        self._found = (name, found)
+        return found
+
+    def _write_slot(self, index: int, state: int, name: bytes = b'', phone: bytes = b'') -> None:
+        self._found = (None, None)
+        offset = HEADER.size + index * SLOT.size
+        SLOT.pack_into(self._map, offset, state, len(name), len(phone), name, phone)
+        COUNTS.pack_into(self._map, HEADER.size - COUNTS.size, self.count, self.deleted)
+        if self.sync:
+            # Flushing only the pages of the header and the changed slot
+            self._map.flush(0, HEADER.size)
+            start = offset - offset % mmap.ALLOCATIONGRANULARITY
+            self._map.flush(start, offset + SLOT.size - start)
+        elif self._flusher is not None:
+            self._flusher.changed()
+
+    def _grow(self) -> None:
+        """Rebuild the table with more slots, dropping deleted ones.
+
+        The new table is filled in a temporary file that replaces the database only
+        when it's complete, so a crash while growing leaves the old table intact.
+        Slots are copied as they are, as the names in them are known to be unique.
+
+        In the write-behind mode the new table is used right away, and the flusher
+        writes it to disk before it replaces the database, so growing doesn't wait
+        for the disk either.
+        """
+        # Copying is what costs while the table is small, so it grows faster then
+        capacity = max(MIN_CAPACITY, self.capacity * (4 if self.capacity < FAST_GROWTH else 2))
+        # Tables yet to be saved by the flusher are still open, so each gets its own file
+        temp_path = self.database.with_name(f'{self.database.name}.{capacity}.tmp')
+        _create(temp_path, capacity)
+        with open(temp_path, "r+b") as temp_file, \
+                mmap.mmap(temp_file.fileno(), 0) as grown:
+            for offset in range(HEADER.size, HEADER.size + self.capacity * SLOT.size,
+                                SLOT.size):
+                if self._map[offset] != USED:
+                    continue
+                name_size = self._map[offset + 1]
+                index = crc32(self._map[offset + 3:offset + 3 + name_size]) % capacity
+                while grown[HEADER.size + index * SLOT.size] != EMPTY:
+                    index = (index + 1) % capacity
+                target = HEADER.size + index * SLOT.size
+                grown[target:target + SLOT.size] = self._map[offset:offset + SLOT.size]
+            HEADER.pack_into(grown, 0, MAGIC, capacity, self.count, 0)
+            if self._flusher is None:
+                grown.flush()
+        if self._flusher is not None:
+            with self._lock:
+                self._retired.append((self._map, self._file, self._replacing))
+                self._replacing = temp_path
+                self._open(temp_path)
+                self._found = (None, None)
+            self._flusher.changed()
+            return
+        with self._lock:
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+            os.replace(temp_path, self.database)
+            self._open()
+            self._found = (None, None)
+
+    def __getitem__(self, name: str) -> str:
+        index, _ = self._find(name.encode("utf-8"))
+        if index is None:
+            raise KeyError(name)
+        _, _, phone_size, _, phone = SLOT.unpack_from(self._map, self._slot_offset(index))
+        return phone[:phone_size].decode("utf-8")
+
+    def __setitem__(self, name: str, phone: str) -> None:
+        name_bytes = name.encode("utf-8")
+        phone_bytes = phone.encode("utf-8")
+        if len(name_bytes) > MAX_NAME_BYTES or len(phone_bytes) > MAX_PHONE_BYTES:
+            raise ValueError('Name or phone is too long.')
+        index, free = self._find(name_bytes)
+        if index is None:
+            if self.count + self.deleted >= self._limit:
+                self._grow()
+                _, free = self._find(name_bytes)
+            index = free
+            if self._map[HEADER.size + index * SLOT.size] == DELETED:
+                self.deleted -= 1
+            self.count += 1
+        self._write_slot(index, USED, name_bytes, phone_bytes)
+
+    def __contains__(self, name) -> bool:
+        return isinstance(name, str) and self._find(name.encode("utf-8"))[0] is not None
+
+    def __delitem__(self, name: str) -> None:
+        index, _ = self._find(name.encode("utf-8"))
+        if index is None:
+            raise KeyError(name)
+        self.count -= 1
+        self.deleted += 1
+        self._write_slot(index, DELETED)
+
+    def __iter__(self):
+        for index in range(self.capacity):
+            state, name_size, _, name, _ = SLOT.unpack_from(self._map, self._slot_offset(index))
+            if state == USED:
+                yield name[:name_size].decode("utf-8")
+
+    def __len__(self) -> int:
+        return self.count
+
+    @contextmanager
+    def transaction(self):
+        """Flush the changes made inside of the block to disk at once, at its end.
+
+        A transaction opened inside of another one joins it.
+        """
+        if not self.sync:
+            yield self
+            return
+        sync, self.sync = self.sync, False
+        try:
+            yield self
+        finally:
+            self.sync = sync
+            self._map.flush()
+
+    def flush(self) -> None:
+        """Write the changed pages of the mapped file to disk.
+
+        A table grown in the write-behind mode replaces the database once it's on disk.
+        """
+        with self._lock:
+            table, replacing = self._map, self._replacing
+            retired, self._retired = self._retired, []
+        for old_map, old_file, old_path in retired:
+            old_map.close()
+            old_file.close()
+            if old_path is not None:
+                # A grown table outgrown before it was saved
+                old_path.unlink(missing_ok=True)
+        if table.closed:
+            return
+        table.flush()
+        if replacing is not None:
+            os.replace(replacing, self.database)
+            with self._lock:
+                if self._replacing == replacing:
+                    self._replacing = None
+
+    def flush_error(self) -> Union[OSError, None]:
+        """Return the error of a failed background write, once, if there is a new one.
+
+        The changes stay in memory and the write is tried again, so the error is
+        only reported to the user.
+        """
+        return None if self._flusher is None else self._flusher.take_error()
+
+    def close(self) -> None:
+        """Stop the write-behind thread, flush the mapped file to disk and close it."""
+        if self._flusher is not None:
+            flusher, self._flusher = self._flusher, None
+            flusher.stop()
+        if not self._map.closed:
+            self._map.flush()
+            self._map.close()
+        self._file.close()
+
+
+def convert_json(json_path, database) -> dict:
+    """Convert a `contacts.json` file into a memory-mapped contacts database.
+
+    Contacts with a name or a phone number too long for a slot are left out and
+    saved to the JSON file name plus '.rejects.json', so they aren't lost.
+
+    Args:
+        json_path: The path to the JSON file with names as keys and phone numbers as values.
+        database: The path of the database to create.
+
+    Returns:
+        dict: Numbers of converted and rejected contacts and the path of the rejects file.
+    """
+    with open(json_path, "r", encoding="utf-8") as contacts_json:
+        contacts_dict = json.load(contacts_json)
+    temp_path = Path(database).with_name(Path(database).name + '.tmp')
+    capacity = MIN_CAPACITY
+    while len(contacts_dict) > capacity * MAX_LOAD:
+        capacity *= 2
+    _create(temp_path, capacity)
+    contacts = MappedContacts(temp_path, sync=False)
+    rejected = {}
+    for name, phone in contacts_dict.items():
+        if len(name.encode("utf-8")) > MAX_NAME_BYTES \
+                or len(phone.encode("utf-8")) > MAX_PHONE_BYTES:
+            rejected[name] = phone
+            continue
+        contacts[name] = phone
+    contacts.close()
+    summary = {'converted': len(contacts_dict) - len(rejected), 'rejected': len(rejected),
+               'rejects': None}
+    if rejected:
+        rejects_path = Path(f'{json_path}.rejects.json')
+        with open(rejects_path, "w", encoding="utf-8") as rejects_file:
+            json.dump(rejected, rejects_file, indent=2)
+        summary['rejects'] = str(rejects_path)
+    os.replace(temp_path, database)
+    return summary
+
+if __name__ == "__main__":
+    pass
@@ -1,11 +1,23 @@
 """Imports"""
 import re
+import sys
 import json
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Union
+from bot_pkg.storage import ContactBook
+from bot_pkg.mapped import MappedContacts, convert_json
+from bot_pkg.colors import mistaken_arg
+from bot_pkg.flusher import atomic_write
+from bot_pkg.search import get_name_index, get_phone_index, save_phone_index, \
+                            index_added, index_removed
 from bot_pkg.decor import read_file_check, validate_two_args, validate_one_arg, \
-                            check_contact_exists
-import colorama
+                            check_contact_exists, validate_search_arg, validate_phone_arg, \
+                            validate_file_arg
 from colorama import Fore
-colorama.init(autoreset=True)
+
+PAGE_SIZE = 50
+NOT_LETTERS = re.compile("[^A-Za-z]")
 
 def parse_input(user_input: str) -> tuple:
     """Split the user's input into command and arguments.
@@ -17,32 +29,60 @@ def parse_input(user_input: str) -> tuple:
         tuple: A tuple containing the command and its arguments.
     """
     cmd, *args = user_input.split()
-    cmd = cmd.strip().lower()
-    cmd = re.sub("[^A-Za-z]", "", cmd)
+    cmd = cmd.lower()
+    if not (cmd.isascii() and cmd.isalpha()):
+        cmd = NOT_LETTERS.sub("", cmd)
     return cmd, *args
 
 @read_file_check
-def read_file(database) -> dict:
-    """Read and parse the contents of a JSON file containing contacts.
-    
+def read_file(database, flush_interval: float = None,
+              flush_changes: int = None) -> Union[ContactBook, MappedContacts]:
+    """Open the contacts database.
+
+    A '.db' database is memory-mapped, so contacts are read only when they are
+    looked up. If it doesn't exist yet, it is converted once from the '.json' file
+    with the same name, leaving out the contacts too long for it (see `convert_json`).
+    Any other database is a JSON snapshot plus the log of changes made after it,
+    with a name index to look contacts up in the snapshot.
+
+    Args:
+        database: The path to the contacts database.
+        flush_interval (float): If given, changes are written to disk by a background
+        thread at most this many seconds later, instead of right away.
+        flush_changes (int): The number of changes written by the background thread
+        at once, without waiting for the interval.
+
     Returns:
-        dict: A dictionary representing the contacts with names as keys and phone numbers as values.
+        Union[ContactBook, MappedContacts]: A dictionary-like object representing the
+        contacts with names as keys and phone numbers as values.
     """
-    with open(database, "r", encoding="utf-8") as contacts_json:
-        contacts_string = contacts_json.read()
-        contacts_dict = json.loads(contacts_string)
-    return contacts_dict
+    database = Path(database)
+    if database.suffix == '.db':
+        if not database.exists() and database.with_suffix('.json').exists():
+            summary = convert_json(database.with_suffix('.json'), database)
+            if summary['rejected']:
+                print(f"{Fore.RED}{summary['rejected']} contacts too long for the database "
+                      f"were left out.\n{Fore.YELLOW}They are saved in {summary['rejects']}.\n")
+        return MappedContacts(database, True, flush_interval, flush_changes)
+    return ContactBook(database, True, flush_interval, flush_changes)
 
 def write_file(database, contacts_dict: dict) -> None:
-    """Writes the given dictionary of contacts to a JSON file named "contacts.json".
+    """Writes the given dictionary of contacts to the JSON snapshot of the database.
+
+    A `ContactBook` or a `MappedContacts` is only closed, as its changes are on disk
+    already, otherwise the whole dictionary is written. The file is replaced
+    atomically, so a crash never leaves it half-written. The phone index, if it
+    was used, is saved next to the database.
 
     Args:
         contacts_dict (dict): A dictionary representing the contacts, with
         names as keys and phone numbers as values.
     """
-    contacts_string = json.dumps(contacts_dict, indent=2)
-    with open(database, "w", encoding="utf-8") as contacts_json:
-        contacts_json.write(contacts_string)
+    if isinstance(contacts_dict, (ContactBook, MappedContacts)):
+        contacts_dict.close()
+        save_phone_index(contacts_dict)
+        return
+    atomic_write(database, json.dumps(contacts_dict, indent=2))
 
 @validate_two_args
 @check_contact_exists
@@ -58,6 +98,7 @@ def add_contact(contacts: dict, args: tuple) -> str:
     """
     name, phone = args
     contacts[name] = phone
+    index_added(contacts, name, phone)
     return "Contact added."
 
 @validate_two_args
@@ -72,7 +113,10 @@ def change_contact(contacts: dict, args: tuple) -> str:
         str: A message indicating if the contact was updated successfully or not.
     """
     name, phone = args
+    if name in contacts:
+        index_removed(contacts, name, contacts[name])
     contacts[name] = phone
+    index_added(contacts, name, phone)
     return "Contact added."
 
 @validate_one_arg
@@ -87,7 +131,8 @@ def delete_contact(contacts: dict, args: tuple) -> str:
         str: A message indicating if the contact was deleted successfully or not.
     """
     name = args[0]
-    contacts.pop(name)
+    phone = contacts.pop(name)
+    index_removed(contacts, name, phone)
     return "Contact deleted."
 
 @validate_one_arg
@@ -104,19 +149,140 @@ def show_phone(contacts: dict, args: tuple) -> str:
     name = args[0]
     return phone_line(name, contacts[name])
 
-def show_all(contacts: dict) -> str:
-    """Display all the contacts.
+@validate_search_arg
+def find_contact(contacts: dict, args: tuple) -> str:
+    """Finds contacts by the beginning of the name or, if there are none, by similar names.
 
     Args:
         contacts (dict): A dictionary containing contacts base.
+        args (tuple): A tuple containing the name or its beginning. Case-insensitive.
 
     Returns:
-        str: The formatted list of contacts.
+        str: The formatted list of found contacts or an error message if nothing is found.
+    """
+    index = get_name_index(contacts)
+    names = index.prefix(args[0]) or index.fuzzy(args[0])
+    if not names:
+        return mistaken_arg('nothing found')
+    return ''.join(phone_line(name, contacts[name]) for name in names)
+
+@validate_phone_arg
+def find_by_phone(contacts: dict, args: tuple) -> str:
+    """Finds the owners of a phone number. 10 and 13 digit forms of a number are the same.
+
+    Args:
+        contacts (dict): A dictionary containing contacts base.
+        args (tuple): A tuple containing the phone number.
+
+    Returns:
+        str: The formatted list of found contacts or an error message if nothing is found.
+    """
+    names = get_phone_index(contacts).find(args[0])
+    if not names:
+        return mistaken_arg('phone not found')
+    return ''.join(phone_line(name, contacts[name]) for name in names)
+
+@validate_file_arg
+def import_file(contacts: dict, args: tuple) -> str:
+    """Adds contacts from a '.csv' or '.jsonl' file, checking them in batches.
+
+    Args:
+        contacts (dict): A dictionary containing contacts base.
+        args (tuple): A tuple containing the path to the file and, optionally,
+        the path of the rejects file.
+
+    Returns:
+        str: A message with the numbers of added and rejected contacts.
+    """
+    # Imported on use, as the csv module isn't needed by the other commands
+    from bot_pkg.bulk import import_contacts
+    try:
+        summary = import_contacts(contacts, *args)
+    except FileNotFoundError:
+        return mistaken_arg('file not found')
+    message = f"Contacts added: {summary['imported']}."
+    if summary['rejected']:
+        message += f"\n{Fore.RED}Rejected: {summary['rejected']}, see {summary['rejects']}."
+    return message
+
+@validate_file_arg
+def export_file(contacts: dict, args: tuple) -> str:
+    """Saves all the contacts to a '.csv' or '.jsonl' file.
+
+    Args:
+        contacts (dict): A dictionary containing contacts base.
+        args (tuple): A tuple containing the path of the file.
+
+    Returns:
+        str: A message with the number of saved contacts.
+    """
+    if len(args) != 1:
+        return mistaken_arg('no file')
+    from bot_pkg.bulk import export_contacts
+    return f"Contacts exported: {export_contacts(contacts, args[0])}."
+
+def parse_all_options(args: tuple) -> Union[dict, None]:
+    """Parse options of the 'all' command.
+
+    Supported options are '--page N' and '--size K' (pages are numbered from 1),
+    '--sort name|phone' and '--filter TEXT' (case-insensitive part of the name).
+
+    Args:
+        args (tuple): A tuple containing the options and their values.
+
+    Returns:
+        Union[dict, None]: Parsed options, or None if they are incorrect.
+    """
+    if len(args) % 2:
+        return None
+    options = {'page': None, 'size': PAGE_SIZE, 'sort': None, 'filter': None}
+    for option, value in zip(args[::2], args[1::2]):
+        key = option.lstrip('-')
+        if not option.startswith('--') or key not in options:
+            return None
+        if key in ('page', 'size'):
+            if not value.isdecimal() or not 1 <= int(value) <= sys.maxsize:
+                return None
+            value = int(value)
+        elif key == 'sort' and value not in ('name', 'phone'):
+            return None
+        options[key] = value
+    if options['page'] and options['page'] * options['size'] > sys.maxsize:
+        return None
+    return options
+
+def show_all(contacts: dict, args: tuple = ()) -> Iterator[str]:
+    """Display all the contacts, page by page.
+
+    Pages are formatted one at a time, so the first of them is ready right away
+    regardless of the size of the book. Sorting, though, needs all the names.
+
+    Args:
+        contacts (dict): A dictionary containing contacts base.
+        args (tuple): A tuple containing options of the command, see `parse_all_options`.
+
+    Yields:
+        Iterator[str]: The formatted pages of the list of contacts, or an error message
+        if the options are incorrect.
     """
-    output_of_contacts: str = ''
-    for name in contacts:
-        output_of_contacts += phone_line(name, contacts[name])
-    return output_of_contacts
+    options = parse_all_options(args)
+    if options is None:
+        yield mistaken_arg('invalid options')
+        return
+    names = iter(contacts)
+    if options['filter']:
+        part = options['filter'].lower()
+        names = (name for name in names if part in name.lower())
+    if options['sort'] == 'name':
+        names = iter(sorted(names))
+    elif options['sort'] == 'phone':
+        names = iter(sorted(names, key=lambda name: contacts[name]))
+    size = options['size']
+    if options['page']:
+        start = (options['page'] - 1) * size
+        names = islice(names, start, start + size)
+    while page := list(islice(names, size)):
+        yield ''.join(phone_line(name, contacts[name]) for name in page)
 
 def phone_line(name: str, phone: str) -> str:
     """Formats a contact's name and phone number into a displayable line.
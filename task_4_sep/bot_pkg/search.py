@@ -0,0 +1,392 @@
+"""Imports"""
+import json
+import math
+import re
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict, deque
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+NGRAM = 3
+FUZZY_STEPS = (0.8, 0.6, 0.45)
+BLOCK_SIZE = 512
+NO_LENGTHS = {}
+NO_NUMBERS = frozenset()
+
+
+def _padded(key: str) -> str:
+    return f'{" " * (NGRAM - 1)}{key} '
+
+def _ngrams(key: str) -> Set[str]:
+    """Split a padded lowercase name into overlapping n-grams."""
+    padded = _padded(key)
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+class NameIndex:
+    """Index of contact names for prefix and fuzzy search. Case-insensitive.
+
+    Lowercase names are kept sorted in blocks of up to 2 * BLOCK_SIZE names, with
+    the last name of every block in `maxes`. Adding or removing a name bisects the
+    blocks and shifts one block only, and prefix search bisects them in O(log n)
+    plus the number of results.
+
+    Fuzzy search ranks names by the share of n-grams (3 letters long) they have in
+    common with the query. Every name gets a number, and the numbers of the names
+    having an n-gram are kept in compact arrays by the length of the name, built
+    with the index and appended to as names are added. A query makes sets of the
+    arrays it uses, which are kept up to date too. A removed name only loses its
+    number, which comes back if the name is added again, and the postings are
+    rebuilt without the unused numbers once these outnumber the names.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        keys = sorted((name.lower(), name) for name in dict.fromkeys(names))
+        self.blocks: List[List[Tuple[str, str]]] = [keys[i:i + BLOCK_SIZE]
+                                                    for i in range(0, len(keys), BLOCK_SIZE)]
+        self.maxes: List[Tuple[str, str]] = [block[-1] for block in self.blocks]
+        self.lengths = Counter(len(key) for key, _ in keys)
+        self._index_ngrams(keys)
+
+    def _index_ngrams(self, keys: List[Tuple[str, str]]) -> None:
+        """Number the names and build the postings of their n-grams from scratch."""
+        self.ngrams: Dict[str, Dict[int, array]] = {}
+        self._sets: Dict[Tuple[str, int], Set[int]] = {}
+        self._names: List[Union[str, None]] = [name for _, name in keys]
+        self._numbers: Dict[str, int] = {name: number for number, name in enumerate(self._names)}
+        # Removed names, with the numbers still listed in the postings
+        self._unused: Dict[str, int] = {}
+        by_length = defaultdict(list)
+        for number, (key, _) in enumerate(keys):
+            by_length[len(key)].append(number)
+        for length, numbers in by_length.items():
+            padded_keys = [_padded(keys[number][0]) for number in numbers]
+            postings = defaultdict(lambda: array('I'))
+            for start in range(length + 1):
+                # The n-grams at one position of all the names, appended without
+                # running any bytecode per name. A name repeating an n-gram is
+                # listed twice, which the sets made of the arrays don't keep
+                grams = map(itemgetter(slice(start, start + NGRAM)), padded_keys)
+                deque(map(array.append, map(postings.__getitem__, grams), numbers), maxlen=0)
+            for gram, gram_numbers in postings.items():
+                self.ngrams.setdefault(gram, {})[length] = gram_numbers
+
+    def _posting(self, gram: str, length: int) -> Set[int]:
+        """Return the numbers of the names of the length having the n-gram as a set."""
+        numbers = self._sets.get((gram, length))
+        if numbers is None:
+            listed = self.ngrams.get(gram, NO_LENGTHS).get(length)
+            if listed is None:
+                return NO_NUMBERS
+            numbers = self._sets[gram, length] = set(listed)
+        return numbers
+
+    def add(self, name: str) -> None:
+        """Add a name to the index."""
+        if name in self._numbers:
+            return
+        key = name.lower()
+        item = (key, name)
+        if not self.blocks:
+            self.blocks.append([item])
+            self.maxes.append(item)
+        else:
+            position = min(bisect_left(self.maxes, item), len(self.maxes) - 1)
+            block = self.blocks[position]
+            insort(block, item)
+            self.maxes[position] = block[-1]
+            if len(block) > 2 * BLOCK_SIZE:
+                self.blocks[position:position + 1] = [block[:BLOCK_SIZE], block[BLOCK_SIZE:]]
+                self.maxes[position:position + 1] = [block[BLOCK_SIZE - 1], block[-1]]
+        self.lengths[len(key)] += 1
+        number = self._unused.pop(name, None)
+        if number is None:
+            number = len(self._names)
+            self._names.append(name)
+            for gram in _ngrams(key):
+                by_length = self.ngrams.get(gram)
+                if by_length is None:
+                    by_length = self.ngrams[gram] = {}
+                numbers = by_length.get(len(key))
+                if numbers is None:
+                    numbers = by_length[len(key)] = array('I')
+                numbers.append(number)
+                numbers = self._sets.get((gram, len(key)))
+                if numbers is not None:
+                    numbers.add(number)
+        else:
+            self._names[number] = name
+        self._numbers[name] = number
+
+    def remove(self, name: str) -> None:
+        """Remove a name from the index."""
+        number = self._numbers.pop(name, None)
+        if number is None:
+            return
+        key = name.lower()
+        item = (key, name)
+        position = bisect_left(self.maxes, item)
+        block = self.blocks[position]
+        del block[bisect_left(block, item)]
+        if block:
+            self.maxes[position] = block[-1]
+        else:
+            del self.blocks[position]
+            del self.maxes[position]
+        self.lengths[len(key)] -= 1
+        if not self.lengths[len(key)]:
+            del self.lengths[len(key)]
+        self._names[number] = None
+        self._unused[name] = number
+        if len(self._unused) > max(BLOCK_SIZE, len(self._numbers)):
+            self._index_ngrams(list(chain.from_iterable(self.blocks)))
+
+    def prefix(self, prefix: str, limit: int = 20) -> List[str]:
+        """Find names starting with the prefix.
+
+        Args:
+            prefix (str): The beginning of the name.
+            limit (int): The maximum number of names to return.
+
+        Returns:
+            List[str]: Found names in alphabetical order of their lowercase forms.
+        """
+        prefix = prefix.lower()
+        found = []
+        position = bisect_left(self.maxes, (prefix,))
+        if position == len(self.blocks):
+            return found
+        start = bisect_left(self.blocks[position], (prefix,))
+        while position < len(self.blocks) and len(found) < limit:
+            for key, name in self.blocks[position][start:start + limit - len(found)]:
+                if not key.startswith(prefix):
+                    return found
+                found.append(name)
+            position += 1
+            start = 0
+        return found
+
+    def _fuzzy_scored(self, grams: Set[str], limit: int, threshold: float) -> List[tuple]:
+        """Score the names most similar to the n-grams of a query, see `fuzzy`.
+
+        Lengths are visited from the ones that can score the highest, and once
+        `limit` names are found, the score of the last of them becomes the threshold,
+        so lengths and names that can't beat it are skipped.
+
+        Returns:
+            List[tuple]: (negated score, name) pairs of at most `limit` names, best first.
+        """
+        size = len(grams)
+
+        def best_score(length: int) -> float:
+            # All n-grams of the shorter of the query and the name are in common
+            return 2 * min(size, length + 1) / (size + length + 1)
+
+        scored = []
+        for length in sorted(self.lengths, key=best_score, reverse=True):
+            if best_score(length) < threshold:
+                break
+            # A name scoring above the threshold shares at least `needed` n-grams with
+            # the query, so it has to contain one of the rarest size - needed + 1 of them
+            needed = max(1, math.ceil(threshold * (size + length + 1) / 2 - 1e-9))
+            postings = sorted((self._posting(gram, length) for gram in grams), key=len)
+            rarest = size - needed + 1
+            counts = Counter(chain.from_iterable(postings[:rarest]))
+            for numbers in postings[rarest:]:
+                counts.update(numbers.intersection(counts))
+            for number, common in counts.items():
+                name = self._names[number] if common >= needed else None
+                if name is not None:
+                    score = 2 * common / (size + length + 1)
+                    if score >= threshold:
+                        scored.append((-score, name))
+            if len(scored) >= limit:
+                scored.sort()
+                threshold = -scored[limit - 1][0]
+                scored = [item for item in scored if -item[0] >= threshold]
+        scored.sort()
+        return scored[:limit]
+
+    def fuzzy(self, query: str, limit: int = 5, threshold: float = 0.3) -> List[str]:
+        """Find names similar to the query, e.g. with typos.
+
+        The search is tried with the thresholds of FUZZY_STEPS above the given one
+        first: a higher threshold makes fewer candidates, and if it finds `limit`
+        names, they are the most similar ones anyway.
+
+        Args:
+            query (str): The name to look for.
+            limit (int): The maximum number of names to return.
+            threshold (float): The minimal similarity (Dice coefficient of n-grams).
+                A name of n letters is counted as having n + 1 n-grams.
+
+        Returns:
+            List[str]: Found names, the most similar first.
+        """
+        grams = _ngrams(query.lower())
+        for step in [step for step in FUZZY_STEPS if step > threshold] + [threshold]:
+            scored = self._fuzzy_scored(grams, limit, step)
+            if len(scored) >= limit:
+                break
+        return [name for _, name in scored]
+
+
+def get_name_index(contacts) -> NameIndex:
+    """Return the name index of a contacts book, building it on the first use.
+
+    The index is kept in the `name_index` attribute of the book. Plain dictionaries
+    can't hold it, so for them it is built on every call.
+
+    Args:
+        contacts: A dictionary-like object containing contacts base.
+
+    Returns:
+        NameIndex: The index kept up to date by `add_contact` and `delete_contact`.
+    """
+    index = getattr(contacts, 'name_index', None)
+    if index is None:
+        index = NameIndex(contacts)
+        try:
+            contacts.name_index = index
+        except AttributeError:
+            pass
+    return index
+
+def normalize_phone(phone: str) -> str:
+    """Bring a phone number to the key of the phone index.
+
+    The last 10 digits are kept, so '0501234567' and '+380501234567' have the same key.
+
+    Args:
+        phone (str): The phone number in any format.
+
+    Returns:
+        str: The normalized phone number.
+    """
+    return re.sub(r'\D', '', phone)[-10:]
+
+class PhoneIndex:
+    """Index of contact names by their normalized phone numbers."""
+
+    def __init__(self, contacts=None) -> None:
+        self.phones: Dict[str, Set[str]] = {}
+        if contacts is not None:
+            for name, phone in contacts.items():
+                self.add(name, phone)
+
+    def add(self, name: str, phone: str) -> None:
+        """Add a contact to the index."""
+        self.phones.setdefault(normalize_phone(phone), set()).add(name)
+
+    def remove(self, name: str, phone: str) -> None:
+        """Remove a contact from the index."""
+        key = normalize_phone(phone)
+        names = self.phones.get(key)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del self.phones[key]
+
+    def find(self, phone: str) -> List[str]:
+        """Find names of the contacts with the phone number.
+
+        Args:
+            phone (str): The phone number in any format.
+
+        Returns:
+            List[str]: Found names in alphabetical order.
+        """
+        return sorted(self.phones.get(normalize_phone(phone), ()))
+
+def _database_stamp(database: Path) -> list:
+    """Describe the state of the files of a database, to check if a saved index is valid."""
+    stamp = []
+    for path in (database, database.with_name(database.name + '.log')):
+        stat = path.stat() if path.exists() else None
+        stamp.append([stat.st_size, stat.st_mtime_ns] if stat else None)
+    return stamp
+
+def _phone_index_path(database: Path) -> Path:
+    return database.with_name(database.name + '.phones')
+
+def _load_phone_index(database: Path) -> Union[PhoneIndex, None]:
+    """Read the index saved by `save_phone_index`, if it's still valid for the database."""
+    try:
+        with open(_phone_index_path(database), "r", encoding="utf-8") as index_file:
+            saved = json.load(index_file)
+        if saved['stamp'] != _database_stamp(database):
+            return None
+        index = PhoneIndex()
+        index.phones = {key: set(names) for key, names in saved['phones'].items()}
+    except (TypeError, OSError, ValueError, KeyError):
+        return None
+    return index
+
+def get_phone_index(contacts) -> PhoneIndex:
+    """Return the phone index of a contacts book, loading or building it on the first use.
+
+    The index saved by `save_phone_index` is used only if the database hasn't
+    changed since then. The index is kept in the `phone_index` attribute of the book.
+
+    Args:
+        contacts: A dictionary-like object containing contacts base.
+
+    Returns:
+        PhoneIndex: The index kept up to date by `add_contact`, `change_contact`
+        and `delete_contact`.
+    """
+    index = getattr(contacts, 'phone_index', None)
+    if index is not None:
+        return index
+    # Plain dictionaries have no database to keep the index next to
+    database = getattr(contacts, 'database', None)
+    index = _load_phone_index(database) if database is not None else None
+    if index is None:
+        index = PhoneIndex(contacts)
+    try:
+        contacts.phone_index = index
+    except AttributeError:
+        pass
+    return index
+
+def save_phone_index(contacts) -> None:
+    """Save the phone index of a closed contacts book next to its database.
+
+    Nothing is saved if the index wasn't used, as it can be built later.
+
+    Args:
+        contacts: A dictionary-like object containing contacts base.
+    """
+    index = getattr(contacts, 'phone_index', None)
+    database = getattr(contacts, 'database', None)
+    if index is None or database is None:
+        return
+    saved = {'stamp': _database_stamp(database),
+             'phones': {key: sorted(names) for key, names in index.phones.items()}}
+    with open(_phone_index_path(database), "w", encoding="utf-8") as index_file:
+        json.dump(saved, index_file)
+
+def index_added(contacts, name: str, phone: str) -> None:
+    """Add a contact to the indexes of the book that were built."""
+    name_index = getattr(contacts, 'name_index', None)
+    if name_index is not None:
+        name_index.add(name)
+    phone_index = getattr(contacts, 'phone_index', None)
+    if phone_index is not None:
+        phone_index.add(name, phone)
+
+def index_removed(contacts, name: str, phone: str) -> None:
+    """Remove a contact from the indexes of the book that were built."""
+    name_index = getattr(contacts, 'name_index', None)
+    if name_index is not None:
+        name_index.remove(name)
+    phone_index = getattr(contacts, 'phone_index', None)
+    if phone_index is not None:
+        phone_index.remove(name, phone)
+
+
+if __name__ == "__main__":
+    pass
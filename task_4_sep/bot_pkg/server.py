@@ -0,0 +1,106 @@
+"""Imports"""
+import asyncio
+from contextlib import nullcontext
+from pathlib import Path
+from typing import List, Tuple
+from bot_pkg.batch import BATCH_COMMANDS, ANSI_CODE
+from bot_pkg.colors import mistaken_arg
+from bot_pkg.process import parse_input
+from colorama import Fore
+
+# Commands reading or writing local files are not exposed to the network
+SERVER_COMMANDS = {command: handler for command, handler in BATCH_COMMANDS.items()
+                   if command not in ('import', 'export')}
+FLUSH_INTERVAL = 0.05
+
+
+def execute(contacts, line: str) -> Tuple[bool, List[str]]:
+    """Run one command of the line protocol.
+
+    Args:
+        contacts: A dictionary-like object containing contacts base.
+        line (str): The command with its arguments, as in the interactive mode.
+
+    Returns:
+        Tuple[bool, List[str]]: True if the command succeeded, and the lines of its
+        output without colors.
+    """
+    if not line.strip():
+        return False, ['Invalid command.']
+    command, *args = parse_input(line)
+    handler = SERVER_COMMANDS.get(command)
+    output = handler(contacts, args) if handler else mistaken_arg('invalid command')
+    return not output.startswith(Fore.RED), ANSI_CODE.sub('', output).rstrip('\n').split('\n')
+
+async def handle_client(contacts, reader: asyncio.StreamReader,
+                        writer: asyncio.StreamWriter) -> None:
+    """Serve the commands of one client until it sends 'close' or 'exit' or disconnects.
+
+    Every response starts with an 'OK N' or 'ERR N' line followed by N lines of output.
+    Commands run on the event loop one at a time, so changes of the shared book
+    never interleave.
+    """
+    try:
+        while line := await reader.readline():
+            line = line.decode("utf-8", errors="replace")
+            command = parse_input(line)[0] if line.strip() else ''
+            if command in ('close', 'exit'):
+                writer.write(b'OK 1\nGood bye!\n')
+                break
+            succeeded, lines = execute(contacts, line)
+            header = f"{'OK' if succeeded else 'ERR'} {len(lines)}\n"
+            writer.write((header + '\n'.join(lines) + '\n').encode("utf-8"))
+            await writer.drain()
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def group_commit(contacts, interval: float = FLUSH_INTERVAL) -> None:
+    """Flush the changes of the book to disk once per interval instead of once per command.
+
+    A transaction of the book stays open while the task sleeps, so the changes made by
+    all the clients in the meantime are written together. Cancelling the task
+    flushes the last ones.
+    """
+    transaction = getattr(contacts, 'transaction', None)
+    while True:
+        with transaction() if transaction else nullcontext():
+            await asyncio.sleep(interval)
+
+async def serve(contacts, host: str = '127.0.0.1', port: int = None, path: str = None,
+                flush_interval: float = FLUSH_INTERVAL) -> None:
+    """Serve the contacts book over TCP or a Unix socket until cancelled.
+
+    Args:
+        contacts: A dictionary-like object containing contacts base.
+        host (str): The host to listen on, for TCP. Only local clients can connect
+            by default, None listens on all interfaces.
+        port (int): The port to listen on, for TCP.
+        path (str): The path of the Unix socket, used instead of TCP if given.
+        flush_interval (float): Seconds between flushes of the changes to disk.
+    """
+    def client_connected(reader, writer):
+        return handle_client(contacts, reader, writer)
+
+    if path:
+        server = await asyncio.start_unix_server(client_connected, path)
+    else:
+        server = await asyncio.start_server(client_connected, host, port)
+    committer = asyncio.create_task(group_commit(contacts, flush_interval))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        committer.cancel()
+        try:
+            await committer
+        except asyncio.CancelledError:
+            pass
+        if path:
+            Path(path).unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,368 @@
+"""Imports"""
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from json.encoder import encode_basestring_ascii
+from pathlib import Path
+from typing import Union
+from bot_pkg.flusher import WriteBehind, atomic_write
+
+COMPACT_MIN_OPS = 1000
+INDEX_HEADER = struct.Struct('<QQQ')
+MISSING = object()
+
+
+def _snapshot_text(items) -> tuple:
+    """Format contacts as the JSON snapshot and find where every entry is in it.
+
+    The text is what `json.dumps(contacts, indent=2)` gives, one entry per line and
+    ASCII only, so character offsets are byte offsets.
+
+    Returns:
+        tuple: The text and the list of (encoded name, line start, name end) entries.
+    """
+    lines = []
+    entries = []
+    offset = 2
+    for name, phone in items:
+        key = encode_basestring_ascii(name)
+        line = f'  {key}: {json.dumps(phone)}'
+        entries.append((key, offset, offset + 2 + len(key)))
+        lines.append(line)
+        offset += len(line) + 2
+    if not lines:
+        return '{}', entries
+    return '{\n' + ',\n'.join(lines) + '\n}', entries
+
+
+class ContactBook(MutableMapping):
+    """Contacts persisted as a snapshot, its name index and an append-only log.
+
+    The snapshot is the usual `contacts.json` file keyed by name. Its index
+    (`contacts.json.idx`) holds the positions of the entries sorted by name, so
+    opening the book maps both files and a lookup is a binary search that reads
+    only a few entries. Every change made after the snapshot was written is kept
+    in memory and appended to `contacts.json.log` as a single JSON line ('add',
+    'change' or 'del' operation) flushed to disk at once, so a change costs O(1)
+    and survives a crash. When the log grows larger than the book, it is
+    compacted into a new snapshot. Iteration goes in name order of the snapshot,
+    then over the contacts added after it.
+
+    With `flush_interval` set, changes are only collected in memory and a background
+    thread logs them (see `WriteBehind`), so changing the book never waits for the
+    disk. Several changes of the same contact between two flushes are logged once.
+    """
+
+    def __init__(self, database, sync: bool = True, flush_interval: float = None,
+                 flush_changes: int = None) -> None:
+        self.database = Path(database)
+        self.log_path = self.database.with_name(self.database.name + '.log')
+        self.index_path = self.database.with_name(self.database.name + '.idx')
+        self.sync = sync
+        self.log_ops = 0
+        self._log_file = None
+        self._pending = None
+        self._dirty = {}
+        # Names changed after the snapshot, None for the deleted ones
+        self._changes = {}
+        self._size = 0
+        self._snapshot = None
+        self._index = None
+        self._positions = None
+        self._count = 0
+        self._lock = threading.Lock()
+        self._load()
+        self._flusher = None
+        if flush_interval is not None:
+            self._flusher = WriteBehind(self.flush, flush_interval,
+                                        flush_changes or COMPACT_MIN_OPS)
+
+    def _load(self) -> None:
+        """Open the snapshot with its index and replay the operations logged after it."""
+        if not self._open_snapshot():
+            self._rebuild()
+        self._size = self._count
+        try:
+            with open(self.log_path, "r+b") as log_file:
+                end = 0
+                for line in log_file:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError('Incomplete line')
+                        op, name, phone = json.loads(line)
+                    except ValueError:
+                        # Torn last line after a crash
+                        break
+                    self._apply(name, None if op == 'del' else phone)
+                    self.log_ops += 1
+                    end += len(line)
+                if end != os.fstat(log_file.fileno()).st_size:
+                    # Cutting the torn line off, so the next change isn't appended to it
+                    log_file.truncate(end)
+        except FileNotFoundError:
+            pass
+
+    def _open_snapshot(self) -> bool:
+        """Map the snapshot and its index, if the index matches the snapshot.
+
+        Returns:
+            bool: False if the snapshot has to be indexed first.
+        """
+        try:
+            stat = self.database.stat()
+        except FileNotFoundError:
+            return True
+        try:
+            with open(self.index_path, "rb") as index_file:
+                size, mtime_ns, count = INDEX_HEADER.unpack(index_file.read(INDEX_HEADER.size))
+                if (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns) or \
+                        os.fstat(index_file.fileno()).st_size != \
+                        INDEX_HEADER.size + count * 2 * 8:
+                    return False
+                if count:
+                    self._index = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, struct.error):
+            return False
+        if count:
+            with open(self.database, "rb") as snapshot_file:
+                self._snapshot = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._positions = memoryview(self._index)[INDEX_HEADER.size:].cast('Q')
+        self._count = count
+        return True
+
+    def _close_snapshot(self) -> None:
+        if self._positions is not None:
+            self._positions.release()
+            self._index.close()
+            self._snapshot.close()
+        self._snapshot = self._index = self._positions = None
+        self._count = 0
+
+    def _rebuild(self) -> None:
+        """Rewrite a snapshot without a valid index (e.g. an older one) with its index."""
+        with open(self.database, "r", encoding="utf-8") as contacts_json:
+            contacts = json.load(contacts_json)
+        self._write_snapshot(contacts.items())
+
+    def _write_snapshot(self, items) -> None:
+        """Replace the snapshot and its index with the given contacts and map them.
+
+        The snapshot replaces the old one atomically and the index is written after
+        it, so a crash leaves an index that doesn't match and is rebuilt.
+        """
+        text, entries = _snapshot_text(items)
+        entries.sort()
+        positions = array('Q')
+        for _, start, end in entries:
+            positions.append(start)
+            positions.append(end)
+        self._close_snapshot()
+        atomic_write(self.database, text, self.sync)
+        stat = self.database.stat()
+        temp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(temp_path, "wb") as index_file:
+            index_file.write(INDEX_HEADER.pack(stat.st_size, stat.st_mtime_ns, len(entries)))
+            positions.tofile(index_file)
+        os.replace(temp_path, self.index_path)
+        self._open_snapshot()
+
+    def _entry(self, index: int) -> tuple:
+        """Return the encoded name of the entry of the snapshot and where its phone starts."""
+        start, end = self._positions[2 * index], self._positions[2 * index + 1]
+        return self._snapshot[start + 2:end], end + 2
+
+    def _find(self, name: str):
+        """Look a name up in the snapshot, returning the phone or MISSING."""
+        if not self._count or not isinstance(name, str):
+            return MISSING
+        key = encode_basestring_ascii(name).encode("ascii")
+        index = bisect_left(range(self._count), key, key=lambda entry: self._entry(entry)[0])
+        if index == self._count:
+            return MISSING
+        found, start = self._entry(index)
+        if found != key:
+            return MISSING
+        end = self._snapshot.find(b'\n', start)
+        return json.loads(self._snapshot[start:end].rstrip(b','))
+
+    def _get(self, name: str):
+        phone = self._changes.get(name, MISSING) if isinstance(name, str) else MISSING
+        if phone is MISSING:
+            return self._find(name)
+        return MISSING if phone is None else phone
+
+    def _apply(self, name: str, phone) -> bool:
+        """Set (or delete, if the phone is None) a contact in memory.
+
+        Returns:
+            bool: True if the contact existed.
+        """
+        existed = self._get(name) is not MISSING
+        self._changes[name] = phone
+        self._size += (phone is not None) - existed
+        return existed
+
+    def _items(self) -> list:
+        """Return all contacts as (name, phone) pairs."""
+        items = []
+        for index in range(self._count):
+            key, start = self._entry(index)
+            name = json.loads(key)
+            if name not in self._changes:
+                end = self._snapshot.find(b'\n', start)
+                items.append((name, json.loads(self._snapshot[start:end].rstrip(b','))))
+        items.extend((name, phone) for name, phone in self._changes.items()
+                     if phone is not None)
+        return items
+
+    @staticmethod
+    def _log_line(op: str, name: str, phone) -> str:
+        # Same as json.dumps([op, name, phone]), without the generic encoder overhead
+        phone_json = 'null' if phone is None else encode_basestring_ascii(phone)
+        return f'["{op}", {encode_basestring_ascii(name)}, {phone_json}]\n'
+
+    def _append(self, op: str, name: str, phone) -> None:
+        """Append an operation to the log and flush it to disk."""
+        if self._flusher is not None:
+            with self._lock:
+                self._dirty[name] = (op, phone)
+            self._flusher.changed()
+            return
+        line = self._log_line(op, name, phone)
+        if self._pending is not None:
+            self._pending.append(line)
+            return
+        self._write_log([line])
+
+    def _write_log(self, lines: list) -> None:
+        """Write lines of operations to the log with a single flush."""
+        if self._log_file is None:
+            self._log_file = open(self.log_path, "a", encoding="utf-8")
+        self._log_file.write(''.join(lines))
+        self._log_file.flush()
+        if self.sync:
+            os.fsync(self._log_file.fileno())
+        self.log_ops += len(lines)
+        if self.log_ops > max(COMPACT_MIN_OPS, len(self)):
+            self.compact()
+
+    def flush(self) -> None:
+        """Log the changes collected since the last flush, the last one per contact."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+        try:
+            self._write_log([self._log_line(op, name, phone)
+                             for name, (op, phone) in dirty.items()])
+        except OSError:
+            with self._lock:
+                # Keeping the changes for the next attempt, unless they are outdated
+                self._dirty = {**dirty, **self._dirty}
+            raise
+
+    @contextmanager
+    def transaction(self):
+        """Collect the changes made inside of the block and log them with one flush.
+
+        A transaction opened inside of another one joins it, and in the write-behind
+        mode changes are collected anyway.
+        """
+        if self._pending is not None or self._flusher is not None:
+            yield self
+            return
+        self._pending = []
+        try:
+            yield self
+        finally:
+            lines, self._pending = self._pending, None
+            if lines:
+                self._write_log(lines)
+
+    def __getitem__(self, name: str) -> str:
+        with self._lock:
+            phone = self._get(name)
+        if phone is MISSING:
+            raise KeyError(name)
+        return phone
+
+    def __contains__(self, name) -> bool:
+        with self._lock:
+            return self._get(name) is not MISSING
+
+    def __setitem__(self, name: str, phone: str) -> None:
+        with self._lock:
+            existed = self._apply(name, phone)
+        self._append('change' if existed else 'add', name, phone)
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            if self._get(name) is MISSING:
+                raise KeyError(name)
+            self._apply(name, None)
+        self._append('del', name, None)
+
+    def __iter__(self):
+        with self._lock:
+            items = self._items()
+        return (name for name, _ in items)
+
+    def items(self):
+        with self._lock:
+            return self._items()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def compact(self) -> None:
+        """Write a new snapshot of the book with its index and start an empty log.
+
+        A crash leaves either the old or the new snapshot with the log. Changes not
+        logged yet are replayed over the new snapshot later, which gives the same book.
+        """
+        with self._lock:
+            self._write_snapshot(self._items())
+            self._changes = {}
+            self._size = self._count
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        self.log_path.unlink(missing_ok=True)
+        self.log_ops = 0
+
+    def flush_error(self) -> Union[OSError, None]:
+        """Return the error of a failed background write, once, if there is a new one.
+
+        The changes stay in memory and the write is tried again, so the error is
+        only reported to the user.
+        """
+        return None if self._flusher is None else self._flusher.take_error()
+
+    def close(self) -> None:
+        """Stop the write-behind thread and release the files.
+
+        A short log is left to be replayed on the next start, so closing a book with
+        few changes doesn't rewrite the snapshot. A longer one is compacted, so the
+        next start doesn't replay it.
+        """
+        if self._flusher is not None:
+            flusher, self._flusher = self._flusher, None
+            flusher.stop()
+            self.flush()
+        if self.log_ops > COMPACT_MIN_OPS:
+            self.compact()
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        with self._lock:
+            self._close_snapshot()
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,123 @@
+"""Imports"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List, Tuple
+
+DEFAULT_READS = 0.8
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                  command: str) -> Tuple[bool, List[str]]:
+    """Send a command to the assistant server and read its response.
+
+    Args:
+        reader (asyncio.StreamReader): The reading side of the connection.
+        writer (asyncio.StreamWriter): The writing side of the connection.
+        command (str): The command with its arguments.
+
+    Returns:
+        Tuple[bool, List[str]]: True for an 'OK' response, and the lines of output.
+    """
+    writer.write(command.encode("utf-8") + b'\n')
+    await writer.drain()
+    status, count = (await reader.readline()).decode("utf-8").split()
+    lines = [(await reader.readline()).decode("utf-8").rstrip('\n') for _ in range(int(count))]
+    return status == 'OK', lines
+
+async def run_client(args: argparse.Namespace, client: int, latencies: List[float]) -> int:
+    """Send commands of one client one after another, recording their latencies.
+
+    The client adds its own contacts first and then mixes lookups of them with changes.
+
+    Returns:
+        int: The number of failed commands.
+    """
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    rng = random.Random(args.seed + client)
+    names = [f'load{client}_{number}' for number in range(args.contacts)]
+    commands = [f'change {name} {rng.randint(10**9, 10**10 - 1)}' for name in names]
+    for _ in range(args.requests - len(commands)):
+        name = rng.choice(names)
+        if rng.random() < args.reads:
+            commands.append(f'phone {name}')
+        else:
+            commands.append(f'change {name} {rng.randint(10**9, 10**10 - 1)}')
+    failed = 0
+    for command in commands:
+        start = time.perf_counter()
+        succeeded, _ = await request(reader, writer, command)
+        latencies.append(time.perf_counter() - start)
+        failed += not succeeded
+    await request(reader, writer, 'close')
+    writer.close()
+    return failed
+
+def percentile(values: List[float], share: float) -> float:
+    """Return the value below which the given share of the sorted values lies."""
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+async def load_test(args: argparse.Namespace) -> dict:
+    """Run the clients concurrently and summarize their requests.
+
+    Returns:
+        dict: Numbers of clients, requests and failures, requests/sec and latencies
+        in milliseconds.
+    """
+    latencies = []
+    start = time.perf_counter()
+    failures = await asyncio.gather(*(run_client(args, client, latencies)
+                                      for client in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'clients': args.clients,
+        'requests': len(latencies),
+        'failed': sum(failures),
+        'seconds': round(elapsed, 3),
+        'requests_per_sec': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3),
+    }
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description='Load test of the assistant server.')
+    parser.add_argument('--host', default='127.0.0.1', help='server host (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='server port (default: 8000)')
+    parser.add_argument('--unix', help='path of the Unix socket of the server, instead of TCP')
+    parser.add_argument('-c', '--clients', type=int, default=50,
+                        help='number of concurrent clients (default: 50)')
+    parser.add_argument('-n', '--requests', type=int, default=1000,
+                        help='number of requests per client (default: 1000)')
+    parser.add_argument('--contacts', type=int, default=100,
+                        help='number of contacts per client (default: 100)')
+    parser.add_argument('--reads', type=float, default=DEFAULT_READS,
+                        help=f'share of lookups among requests (default: {DEFAULT_READS})')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    parser.add_argument('-o', '--output', help='path of the JSON file to save results to')
+    return parser.parse_args()
+
+def main():
+    """Load the assistant server with concurrent clients and display requests/sec and latencies."""
+    args = parse_args()
+    results = asyncio.run(load_test(args))
+    for key, value in results.items():
+        print(f'{key.ljust(18)}{value}')
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Imports"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+COMMAND_LINES = ['hello', 'phone Report', 'find Rep', 'who 0501234567', 'all --size 5', 'foo']
+
+
+def import_times(runs: int) -> List[dict]:
+    """Measure imports of the assistant with `python -X importtime`.
+
+    Args:
+        runs (int): The number of runs; the fastest time of every module is kept.
+
+    Returns:
+        List[dict]: Modules with their own and cumulative import times in milliseconds
+        and their nesting level, in the order they were imported.
+    """
+    modules = {}
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import assistant'],
+                                cwd=HERE, capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            own, total, name = line[len('import time:'):].split('|')
+            level = (len(name) - len(name.lstrip())) // 2
+            own_ms, total_ms = int(own) / 1000, int(total) / 1000
+            known = modules.setdefault(name.strip(), {'module': name.strip(), 'level': level,
+                                                      'self_ms': own_ms, 'total_ms': total_ms})
+            known['self_ms'] = min(known['self_ms'], own_ms)
+            known['total_ms'] = min(known['total_ms'], total_ms)
+    return list(modules.values())
+
+def startup_times(runs: int) -> dict:
+    """Measure the wall time of starting `assistant.py --help` and of a bare interpreter.
+
+    Returns:
+        dict: The fastest and median times in milliseconds.
+    """
+    times = {}
+    for name, command in (('python', [sys.executable, '-c', 'pass']),
+                          ('assistant', [sys.executable, 'assistant.py', '--help'])):
+        elapsed = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, cwd=HERE, capture_output=True, check=True)
+            elapsed.append(time.perf_counter() - start)
+        times[f'{name}_min_ms'] = round(min(elapsed) * 1000, 1)
+        times[f'{name}_median_ms'] = round(statistics.median(elapsed) * 1000, 1)
+    return times
+
+def command_latency(runs: int) -> dict:
+    """Measure parsing and running of the interactive commands on a small book.
+
+    The book is a `ContactBook` in a temporary directory, so the search indexes are
+    built once, as in a session.
+
+    Returns:
+        dict: The mean time of a command in microseconds, by command line.
+    """
+    sys.path.insert(0, HERE)
+    import assistant
+    from bot_pkg import ContactBook, parse_input
+    latency = {}
+    with tempfile.TemporaryDirectory() as directory, \
+            contextlib.redirect_stdout(io.StringIO()):
+        contacts = ContactBook(os.path.join(directory, 'contacts.json'), sync=False)
+        for number in range(100):
+            contacts[f'Report{number}'] = f'050{number:07d}'
+        for line in COMMAND_LINES:
+            start = time.perf_counter()
+            for _ in range(runs):
+                command, *args = parse_input(line)
+                assistant.COMMANDS.get(command, assistant.invalid_command)(contacts, args)
+            latency[line] = round((time.perf_counter() - start) / runs * 1e6, 2)
+        contacts.close()
+    return latency
+
+def display_report(modules: List[dict], startup: dict, latency: dict, top: int) -> None:
+    """Display the slowest imports, the startup time and the command latencies."""
+    print(f"\n{'Module'.ljust(40)}|{'Self, ms'.rjust(10)}|{'Total, ms'.rjust(11)}")
+    print('_' * 40 + '|' + '_' * 10 + '|' + '_' * 11)
+    for module in sorted(modules, key=lambda module: -module['total_ms'])[:top]:
+        name = '  ' * module['level'] + module['module']
+        print(f"{name.ljust(40)}|{module['self_ms']:10.2f}|{module['total_ms']:11.2f}")
+    print(f"\nImported modules: {len(modules)}, total import time: "
+          f"{sum(module['self_ms'] for module in modules):.1f} ms")
+    print(f"Startup of 'assistant.py --help': {startup['assistant_min_ms']} ms "
+          f"(median {startup['assistant_median_ms']} ms), bare interpreter: "
+          f"{startup['python_min_ms']} ms")
+    print('\nCommand latency, us:')
+    for line, microseconds in latency.items():
+        print(f'  {line.ljust(20)}{microseconds}')
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description='Startup and command latency report of the '
+                                                 'assistant, based on `python -X importtime`.')
+    parser.add_argument('-r', '--runs', type=int, default=10,
+                        help='number of interpreter starts to measure (default: 10)')
+    parser.add_argument('-n', '--commands', type=int, default=10000,
+                        help='number of runs of every command (default: 10000)')
+    parser.add_argument('--top', type=int, default=20,
+                        help='number of the slowest imports to display (default: 20)')
+    parser.add_argument('-o', '--output', help='path of the JSON file to save results to')
+    return parser.parse_args()
+
+def main():
+    """Measure and display the import times, the startup time and the command latencies."""
+    args = parse_args()
+    modules = import_times(args.runs)
+    startup = startup_times(args.runs)
+    latency = command_latency(args.commands)
+    display_report(modules, startup, latency, args.top)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({'startup': startup, 'latency_us': latency, 'imports': modules},
+                      output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()